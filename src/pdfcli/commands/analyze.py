@@ -0,0 +1,166 @@
+from pathlib import Path
+
+from pdfcli.commands.compress import QUALITY_PRESET
+from pdfcli.utils.cli_utils import get_console, spinner
+from pdfcli.utils.page_utils import open_pdf
+from pdfcli.utils.validators import exit_with_error_message
+
+description = """
+Show where the bytes of a PDF go, without rewriting it.\n
+Reports byte totals for images, fonts, content streams and other objects, the biggest objects,
+duplicated streams, and the estimated output size for each compress quality preset.\n
+Estimates recompress only a sample of the largest images (--sample), so this is much faster than a real compress.\n
+Example:\n
+pdfcli analyze input.pdf --top 10
+"""
+
+CATEGORIES = ["images", "fonts", "content streams", "other streams", "other objects"]
+
+FONT_FILE_KEYS = ("/FontFile", "/FontFile2", "/FontFile3")
+
+def execute(input: str, top: int = 10, sample: int = 5) -> None:
+  import zlib
+  from hashlib import sha256
+  from io import BytesIO
+  from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+  from pdfcli.utils.image_utils import detach_object, read_recompressed, recompress_image
+
+  if top < 0 or sample < 0:
+    exit_with_error_message("--top and --sample can't be negative.")
+
+  document = open_pdf(input)
+  reader = document.reader
+  file_size = Path(document.path).stat().st_size
+
+  with spinner("Analyzing..."):
+    # every object in the file except the containers used to store other objects
+    objects = []
+    ids = {(idnum, generation) for generation, table in reader.xref.items() for idnum in table}
+    ids.update((idnum, 0) for idnum in reader.xref_objStm)
+
+    for idnum, generation in sorted(ids):
+      try:
+        obj = reader.get_object(IndirectObject(idnum, generation, reader))
+      except Exception:
+        continue
+      if obj is None:
+        continue
+      if isinstance(obj, StreamObject) and obj.get("/Type") in ("/ObjStm", "/XRef"):
+        continue
+      objects.append((idnum, obj))
+
+    # what each stream is used for
+    font_files, contents = set(), set()
+    for _, obj in objects:
+      if isinstance(obj, DictionaryObject) and obj.get("/Type") == "/FontDescriptor":
+        for key in FONT_FILE_KEYS:
+          ref = obj.raw_get(key) if key in obj else None
+          if isinstance(ref, IndirectObject):
+            font_files.add(ref.idnum)
+
+    for page in reader.pages:
+      value = page.raw_get("/Contents") if "/Contents" in page else None
+      if isinstance(value, IndirectObject) and isinstance(value.get_object(), ArrayObject):
+        value = value.get_object()
+
+      for ref in value if isinstance(value, ArrayObject) else [value]:
+        if isinstance(ref, IndirectObject):
+          contents.add(ref.idnum)
+
+    totals = dict.fromkeys(CATEGORIES, 0)
+    sizes = [] # (size, idnum, category)
+    images = [] # (size, idnum, image)
+    seen_streams = set()
+    duplicate_bytes = 0
+    content_savings = 0
+
+    for idnum, obj in objects:
+      if isinstance(obj, StreamObject):
+        size = len(obj._data)
+        subtype = obj.get("/Subtype")
+
+        if subtype == "/Image":
+          category = "images"
+          images.append((size, idnum, obj))
+        elif idnum in font_files:
+          category = "fonts"
+        elif idnum in contents or subtype == "/Form":
+          category = "content streams"
+          if "/Filter" not in obj: # compress would Flate-encode it
+            content_savings += size - len(zlib.compress(obj._data))
+        else:
+          category = "other streams"
+
+        key = sha256(obj._data).digest()
+        if key in seen_streams:
+          duplicate_bytes += size
+        seen_streams.add(key)
+      else:
+        buffer = BytesIO()
+        obj.write_to_stream(buffer)
+        size = len(buffer.getvalue())
+        category = "other objects"
+
+      totals[category] += size
+      sizes.append((size, idnum, category))
+
+    # recompress the largest images once per preset and scale the ratio to all images
+    images.sort(key=lambda image: image[:2], reverse=True)
+    sampled = [(size, detach_object(image)) for size, _, image in images[:sample]]
+    sampled_bytes = sum(size for size, _ in sampled)
+    image_bytes = totals["images"]
+
+    estimates = {}
+    for preset, quality in QUALITY_PRESET.items():
+      image_savings = 0
+      if quality is not None and sampled_bytes:
+        new_bytes = 0
+        for size, xobject in sampled:
+          try:
+            new_size = len(read_recompressed(recompress_image((xobject, None), quality))._data)
+          except Exception: # images Pillow can't handle are left alone by compress too
+            new_size = size
+          new_bytes += min(size, new_size) # compress keeps the original if it is smaller
+        image_savings = image_bytes * (1 - new_bytes / sampled_bytes)
+
+      estimates[preset] = max(0, file_size - duplicate_bytes - content_savings - image_savings)
+
+  print_report(file_size, totals, sorted(sizes, reverse=True)[:top], duplicate_bytes, estimates)
+
+def print_report(file_size: int, totals: dict, biggest: list, duplicate_bytes: int, estimates: dict) -> None:
+  from rich.table import Table
+
+  console = get_console()
+
+  table = Table(title="Bytes by category")
+  table.add_column("Category")
+  table.add_column("Bytes", justify="right")
+  table.add_column("Share", justify="right")
+  for category, size in totals.items():
+    table.add_row(category, format_size(size), f"{size / file_size:.0%}" if file_size else "-")
+  table.add_row("duplicated streams", format_size(duplicate_bytes), f"{duplicate_bytes / file_size:.0%}" if file_size else "-")
+  console.print(table)
+
+  if biggest:
+    table = Table(title="Biggest objects")
+    table.add_column("Object", justify="right")
+    table.add_column("Category")
+    table.add_column("Bytes", justify="right")
+    for size, idnum, category in biggest:
+      table.add_row(str(idnum), category, format_size(size))
+    console.print(table)
+
+  table = Table(title="Estimated compress output")
+  table.add_column("Quality")
+  table.add_column("Size", justify="right")
+  table.add_column("Savings", justify="right")
+  for preset, size in estimates.items():
+    table.add_row(preset, format_size(size), f"{1 - size / file_size:.0%}" if file_size else "-")
+  console.print(table)
+
+def format_size(size: float) -> str:
+  for unit in ("B", "KB", "MB"):
+    if size < 1024:
+      return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+    size /= 1024
+  return f"{size:.1f} GB"
@@ -0,0 +1,136 @@
+from pathlib import Path
+from typing import List, Tuple
+import typer
+
+from pdfcli.utils.cli_utils import get_console, rprint
+from pdfcli.utils.page_utils import create_path
+from pdfcli.utils.validators import exit_with_error_message
+
+description = """
+Run a command on every PDF in a folder.\n
+Files are processed by a pool of worker processes (--jobs), each importing pypdf once and
+running the command in-process. A file that fails doesn't stop the others, and a summary is printed at the end.\n
+Options after '--' are passed to the command. Commands that ask for input (e.g. a missing password) fail for that file.\n
+Supported commands: compress, encrypt, decrypt, trim, reorder, split, pdf2img.\n
+Example:\n
+pdfcli batch compress in_pdfs -o out_pdfs -j 4 -- --quality low\n
+pdfcli batch trim in_pdfs -o out_pdfs -- -p 1-2
+"""
+
+# command: whether it writes a folder (named after the input) instead of a single PDF
+BATCH_COMMANDS = {
+  "compress": False,
+  "encrypt": False,
+  "decrypt": False,
+  "trim": False,
+  "reorder": False,
+  "split": True,
+  "pdf2img": True
+}
+
+# (input, output, command line to run)
+BatchTask = Tuple[str, str, List[str]]
+# (input, succeeded, message)
+BatchResult = Tuple[str, bool, str]
+
+def execute(command: str, input_folder: str, output_folder: str, jobs: int = 1, extra_args: List[str] | None = None) -> None:
+  from concurrent.futures import ProcessPoolExecutor
+  from time import perf_counter
+  from pdfcli.utils.workers import check_jobs, ordered_map
+
+  check_jobs(jobs)
+
+  if command not in BATCH_COMMANDS:
+    exit_with_error_message(f"Invalid command: {command}. Use one of: {', '.join(BATCH_COMMANDS)}.")
+
+  folder = Path(input_folder)
+  if not folder.is_dir():
+    exit_with_error_message(f"Folder not found: {input_folder}")
+
+  inputs = sorted(path for path in folder.iterdir() if path.is_file() and path.suffix.lower() == ".pdf")
+  if not inputs:
+    exit_with_error_message(f"No PDF files in {input_folder}")
+
+  output_folder = create_path(output_folder)
+
+  tasks, results = [], []
+  for path in inputs:
+    output = Path(output_folder) / (path.stem if BATCH_COMMANDS[command] else path.name)
+    # commands ask before overwriting, and workers can't answer
+    if output.exists():
+      results.append((str(path), False, f"{output} already exists"))
+    else:
+      tasks.append((str(path), str(output), [command, str(path), "-o", str(output), *(extra_args or [])]))
+
+  # Always run in worker processes, even for one job, so commands can't prompt on this
+  # terminal and a crash in one file can't take the batch down.
+  start = perf_counter()
+  with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker) as pool:
+    for result in ordered_map(pool, run_task, tasks, lookahead=jobs * 2):
+      input, succeeded, message = result
+      rprint(f"{'Done' if succeeded else 'Failed'}: {Path(input).name}", status=0 if succeeded else 1)
+      results.append(result)
+  elapsed = perf_counter() - start
+
+  print_summary(command, results, elapsed)
+
+  if any(not succeeded for _, succeeded, _ in results):
+    raise typer.Exit(code=1)
+
+# Load the CLI and its heavy dependencies once per worker instead of once per file.
+# Nobody can answer a prompt from a worker, so prompts get end-of-file and fail the file:
+# stdin is emptied, and the worker leaves the terminal so password prompts can't open it.
+def init_worker() -> None:
+  import os
+  import sys
+  import pypdf # noqa: F401
+  import pdfcli.main # noqa: F401
+
+  sys.stdin = open(os.devnull)
+  if hasattr(os, "setsid"):
+    os.setsid()
+
+# Run one command line in this process, capturing its output for the summary.
+def run_task(task: BatchTask) -> BatchResult:
+  import click
+  from contextlib import redirect_stderr, redirect_stdout
+  from io import StringIO
+  from typer.main import get_command
+  from pdfcli.main import app
+
+  input, _, args = task
+  captured = StringIO()
+
+  try:
+    with redirect_stdout(captured), redirect_stderr(captured):
+      code = get_command(app).main(args, prog_name="pdfcli", standalone_mode=False)
+  except click.Abort:
+    return (input, False, "the command asked for input (e.g. a password)")
+  except click.ClickException as e:
+    return (input, False, e.format_message())
+  except Exception as e:
+    return (input, False, f"{type(e).__name__}: {e}")
+
+  lines = [line for line in captured.getvalue().splitlines() if line.strip()]
+  if code:
+    errors = [line for line in lines if line.startswith("Error!")]
+    return (input, False, (errors or lines or ["failed"])[-1].removeprefix("Error! "))
+
+  return (input, True, lines[-1] if lines else "")
+
+def print_summary(command: str, results: List[BatchResult], elapsed: float) -> None:
+  from rich.table import Table
+
+  failed = [(input, message) for input, succeeded, message in results if not succeeded]
+
+  if failed:
+    table = Table(title="Failed files")
+    table.add_column("File")
+    table.add_column("Reason")
+    for input, message in failed:
+      table.add_row(Path(input).name, message)
+    get_console().print(table)
+
+  rate = len(results) / elapsed if elapsed else 0
+  rprint(f"{command}: {len(results) - len(failed)} succeeded, {len(failed)} failed "
+    f"in {elapsed:.1f}s ({rate:.1f} files/sec)", status=1 if failed else 0)
@@ -1,11 +1,13 @@
 from pathlib import Path
-from pypdf import PdfWriter
-from pdfcli.utils.cli_utils import rprint
-from pdfcli.utils.page_utils import check_output, read_pdf
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from typing import TYPE_CHECKING
+from pdfcli.utils.cli_utils import rprint, spinner
+from pdfcli.utils.page_utils import check_output, read_pdf, write_pdf
 
 from pdfcli.utils.validators import exit_with_error_message
 
+if TYPE_CHECKING:
+  from pypdf import PdfWriter
+
 description = """
 Compress a PDF file into a smaller size.
 
@@ -18,6 +20,11 @@ This command supports both lossless and lossy compression:
 You may use a preset (listed below) or a numeric JPEG quality value (100-1),
 where 100 keeps the original quality and 1 is the lowest quality.\n\n
 
+• Images drawn at more than --max-dpi are downsampled to that resolution.
+Recompressed images are only kept if they are smaller than the original.\n\n
+
+Image recompression can run on several processes with --jobs.\n\n
+
 If neither --level nor --quality is provided, defaults are used:\n
 level = 6, quality = medium.\n\n
 
@@ -37,11 +44,35 @@ QUALITY_PRESET = {
   "verylow": 30
 }
 
-def execute(file_input: str, output: str, level: int = 6, quality: str = "medium") -> None:
+def execute(file_input: str, output: str, level: int = 6, quality: str = "medium", jobs: int = 1,
+  verbose: bool = False, max_dpi: int | None = None, object_streams: bool = False) -> None:
+  from pypdf import PdfWriter
+  from pdfcli.utils.workers import check_jobs
 
+  check_jobs(jobs)
   output = check_output(output)
   reader = read_pdf(file_input)
 
+  quality_value = check_options(quality, level, max_dpi)
+
+  with spinner("Compressing..."):
+    try:
+      writer = PdfWriter(clone_from=reader)
+
+      if reader.metadata:
+        writer.add_metadata(reader.metadata)
+      
+      compress_writer(writer, level=level, quality=quality_value, jobs=jobs, verbose=verbose, max_dpi=max_dpi)
+
+      write_pdf(writer, output, object_streams=object_streams)
+      
+    except Exception as e:
+      exit_with_error_message(f"Failed to compress PDF: {e}")
+  
+  completion_message(file_input, output)
+
+# Validate the options and return the JPEG quality for images (None for lossless).
+def check_options(quality: str, level: int, max_dpi: int | None) -> int | None:
   try:
     q = int(quality)
     if 1 <= q <= 100:
@@ -56,36 +87,67 @@ def execute(file_input: str, output: str, level: int = 6, quality: str = "medium
   if level not in range(0, 10):
     exit_with_error_message(f"Level is outside of range. Accepted range is 0 - 9.")
 
-  with Progress(
-    SpinnerColumn(),
-    TextColumn("[progress.description]{task.description}"),
-    transient=True
-  ) as progress:
-    progress.add_task(description="Compressing...", total=None)
-
-    try:
-      writer = PdfWriter(clone_from=reader)
-
-      if reader.metadata:
-        writer.add_metadata(reader.metadata)
-      
-      # removing duplicates
-      writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
-
-      # lossless compression
-      for page in writer.pages:
-        if quality_value is not None:
-          for img in page.images:
-            img.replace(img.image, quality=quality_value)
-        page.compress_content_streams(level=level)
-
-      with open(output, "wb") as f:
-        writer.write(f)
-      
-    except Exception as e:
-      exit_with_error_message(f"Failed to compress PDF: {e}")
-  
-  completion_message(file_input, output)
+  if max_dpi is not None:
+    if max_dpi < 1:
+      exit_with_error_message("Max DPI must be at least 1.")
+    if quality_value is None:
+      exit_with_error_message("--max-dpi needs a lossy --quality, not 'lossless'.")
+
+  return quality_value
+
+# Compress a document in place. Shared with the pipeline command.
+def compress_writer(writer: "PdfWriter", *, level: int = 6, quality: int | None = None, jobs: int = 1,
+  verbose: bool = False, max_dpi: int | None = None) -> None:
+  from contextlib import nullcontext
+  from functools import partial
+  from pdfcli.utils.image_utils import (attach_image, collect_images, detach_object, image_key,
+    image_placements, recompress_image, target_size)
+  from pdfcli.utils.workers import create_executor, ordered_map
+
+  # removing duplicates
+  writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+
+  # lossy image compression. Each distinct image is decoded, downsampled if needed
+  # and re-encoded by a worker, then swapped back into the writer in page order.
+  if quality is not None:
+    images = collect_images(writer.pages)
+    placements = image_placements(writer.pages) if max_dpi else {}
+    recompress = partial(recompress_image, quality=quality)
+
+    # (content hash, target size) -> first image with that key. Only these are
+    # recompressed, every other reference with the same key reuses the cached result.
+    keys_by_id = {}
+    unique = {}
+    for ref in images:
+      if ref.idnum not in keys_by_id:
+        xobject = ref.get_object()
+        placed = placements.get(ref.idnum)
+        size = target_size(xobject, placed, max_dpi) if placed else None
+        keys_by_id[ref.idnum] = (image_key(xobject), size)
+      unique.setdefault(keys_by_id[ref.idnum], ref)
+
+    with create_executor(jobs) or nullcontext() as pool:
+      tasks = ((detach_object(ref), size) for (_, size), ref in unique.items())
+      cache = dict(zip(unique, ordered_map(pool, recompress, tasks, lookahead=jobs * 2)))
+
+    # a recompressed image only replaces the original if it is smaller
+    attached = set()
+    kept = 0
+    for ref in images:
+      if ref.idnum not in attached:
+        attached.add(ref.idnum)
+        if not attach_image(writer, ref, cache[keys_by_id[ref.idnum]]):
+          kept += 1
+
+    if verbose:
+      # a hit is an image object that reused another object's result, not another
+      # reference to an object that was already counted
+      rprint(f"Image cache: {len(keys_by_id) - len(cache)} hits, {len(cache)} misses")
+      rprint(f"Images downsampled: {sum(1 for _, size in unique if size)}, kept original: {kept}")
+
+  # lossless compression
+  for page in writer.pages:
+    page.compress_content_streams(level=level)
 
 def completion_message(input_path: str, output_path: str) -> str:
 
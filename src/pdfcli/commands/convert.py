@@ -1,69 +1,172 @@
 # Images to PDF
-from PIL import Image
-from typing import List
-from pdf2image import convert_from_path
-import rich
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from pathlib import Path
+from typing import List, Tuple
+import typer
 
-from pdfcli.utils.page_utils import check_output, create_path, get_pdf_password
-from pdfcli.utils.validators import ensure_extension
+from pdfcli.utils.cli_utils import rprint, spinner
+from pdfcli.utils.page_utils import check_output, create_path, gather_inputs, select_pages, worker_ranges
+from pdfcli.utils.validators import ensure_extension, exit_with_error_message
 
 img2pdf_desc = """
   Convert images to a single PDF.\n
-  Order of input images determines the page order.\n
+  Order of input images determines the page order. JPEGs are embedded as-is, without re-encoding.
+  Black-and-white scans and palette images (e.g. GIFs, 8-bit PNGs) are stored losslessly.
+  Every frame of a multi-page image (e.g. a scanned TIFF) becomes its own page.\n
+  Other images can be decoded and encoded in parallel with --jobs, using threads or processes (--executor).\n
+  Images can also be listed in a manifest file (--manifest), one path per line.\n
   Example:\n
   pdfcli image1.png image2.png image3.png -o output.pdf
   """
 
-def img2pdf_execution(images: List[str], output: str) -> None:
-    
-  pil_images = []
-  output = check_output(output)
-
-  with Progress(
-    SpinnerColumn(),
-    TextColumn("[progress.description]{task.description}"),
-    transient=True
-  ) as progress:
-    progress.add_task(description="Converting...", total=None)
-    for img in images:
-      im = Image.open(img)
-      if im.mode == "RGBA":
-        im = im.convert("RGB")
-      pil_images.append(im)
+def img2pdf_execution(images: List[str], output: str, jobs: int = 1, executor: str = "thread",
+  manifest: str | None = None) -> None:
+  from contextlib import nullcontext
+  from pdfcli.utils.image_pdf import ImagePdfWriter, load_image
+  from pdfcli.utils.workers import check_jobs, create_executor, ordered_map
 
-    first = pil_images[0]
-    rest = pil_images[1:]
+  check_jobs(jobs, executor)
+  images = gather_inputs(images, manifest)
+  output = check_output(output)
 
-    first.save(output, save_all=True, append_images=rest)
+  # Images are decoded and encoded by the pool, but pages are written in input order as
+  # they complete. Only a few images per worker are in flight, so memory stays flat.
+  with spinner("Converting..."):
+    try:
+      with create_executor(jobs, executor) or nullcontext() as pool, open(output, "wb") as f:
+        writer = ImagePdfWriter(f)
+        for frames in ordered_map(pool, load_image, images, lookahead=jobs * 2):
+          for image in frames: # one page per frame, e.g. of a multi-page TIFF
+            writer.add_page(image)
+        writer.close()
+    except Exception as e:
+      exit_with_error_message(f"Failed to convert images: {e}")
 
-  rich.print(f"[green]Created PDF {output}[/green]")
+  rprint(f"Created PDF {output}", status=0)
 
 # PDF to Images
 
 pdf2img_desc = """
-  Convert each PDF page into a PNG.\n
-  The page order determines the image order.\n
+  Convert PDF pages into images.\n
+  The page order determines the image order. Use --page to convert only some pages, e.g. '1-5,9'.\n
+  Supported formats: png, jpeg, webp. --quality (1-100) applies to jpeg and webp.\n
+  Each worker renders its pages with a single pdftoppm run and saves them one at a time, so memory use stays flat for long documents.\n
   Example:\n
-  pdfcli file.pdf -o out_images 
+  pdfcli pdf2img file.pdf -o out_images -p 1-3 --dpi 100 --format jpeg
   """
 
-def pdf2img_execution(input: str, output_folder: str) -> None:
+DEFAULT_DPI = 200
+
+# format name: (Pillow format, file extension)
+IMAGE_FORMATS = {
+  "png": ("PNG", "png"),
+  "jpeg": ("JPEG", "jpg"),
+  "webp": ("WEBP", "webp")
+}
+
+def pdf2img_execution(input: str, output_folder: str, jobs: int = 1, pages: str | None = None,
+  dpi: int = DEFAULT_DPI, fmt: str = "png", quality: int | None = None) -> None:
+  from contextlib import nullcontext
+  from functools import partial
+  from pdfcli.utils.workers import check_jobs, create_executor, ordered_map
 
   input = ensure_extension(input)
-  password = get_pdf_password(input) # in case the file is protected
-  
+  if not Path(input).exists():
+    exit_with_error_message(f"File not found: {input}")
+
+  check_jobs(jobs)
+
+  if dpi < 1:
+    exit_with_error_message("DPI must be at least 1.")
+
+  fmt = fmt.lower()
+  if fmt not in IMAGE_FORMATS:
+    exit_with_error_message(f"Invalid image format: {fmt}. Supported formats: {', '.join(IMAGE_FORMATS)}.")
+
+  if quality is not None and not 1 <= quality <= 100:
+    exit_with_error_message("Quality is outside of range. Accepted range is 1 - 100.")
+
+  # Pages are rendered by poppler, so the page count and password come from poppler too.
+  total_pages, password = pdf_info(input)
+
+  if pages:
+    page_numbers = [page + 1 for page in select_pages(pages, total_pages).ascending()]
+  else:
+    page_numbers = range(1, total_pages + 1)
+
   output_folder = create_path(output_folder, default="out_images")
-  pages = convert_from_path(input, userpw=password)
-
-  with Progress(
-    SpinnerColumn(),
-    TextColumn("[progress.description]{task.description}"),
-    transient=True
-  ) as progress:
-    progress.add_task(description="Converting...", total=None)
-    for i, page in enumerate(pages):
-      out_path = f"{output_folder}/page_{i+1}.png"
-      page.save(out_path, "PNG")
-
-  rich.print(f"[green]Images saved to {output_folder}/[/green]")
\ No newline at end of file
+
+  # poppler opens the document once per range, so ranges are only as many as the workers
+  # (or the runs of consecutive pages in the selection) need. pdftoppm writes each range
+  # to disk and the pages are saved from there one at a time.
+  chunks = worker_ranges(page_numbers, jobs)
+  render = partial(render_pages, input, output_folder, password=password, dpi=dpi, fmt=fmt, quality=quality)
+
+  with spinner("Converting..."):
+    try:
+      with create_executor(jobs) or nullcontext() as pool:
+        for _ in ordered_map(pool, render, chunks, lookahead=jobs * 2):
+          pass
+    except Exception as e:
+      exit_with_error_message(f"Failed to convert PDF: {e}")
+
+  rprint(f"Images saved to {output_folder}/", status=0)
+
+# The page count from one pdfinfo run, and the password it took, if any.
+# The password is only asked for when pdfinfo can't open the file without one.
+def pdf_info(input: str) -> Tuple[int, str | None]:
+  from pdf2image import pdfinfo_from_path
+  from pdf2image.exceptions import PDFInfoNotInstalledError, PDFPageCountError
+
+  tries = 3
+  password = None
+
+  while True:
+    try:
+      return pdfinfo_from_path(input, userpw=password)["Pages"], password
+    except PDFInfoNotInstalledError:
+      exit_with_error_message("Poppler is not installed. pdf2img needs its pdfinfo and pdftoppm tools.")
+    except PDFPageCountError as e:
+      if "Incorrect password" not in str(e):
+        exit_with_error_message(f"Failed to read PDF: {e}")
+
+    if password is not None: # wrong password
+      tries -= 1
+      rprint(f"Wrong password. {tries} tries left.", status=1)
+      if tries == 0:
+        exit_with_error_message("Failed to decrpyt PDF.")
+
+    password = typer.prompt(f"{Path(input).name} is encrypted. Enter password", hide_input=True)
+
+# Render pages first..last (1-indexed, inclusive) and save them as page_N.<ext>.
+# Kept at module level so it can be sent to worker processes.
+def render_pages(input: str, output_folder: str, pages: Tuple[int, int], *, password: str | None = None,
+  dpi: int = DEFAULT_DPI, fmt: str = "png", quality: int | None = None) -> None:
+  import subprocess
+  from PIL import Image
+
+  first, last = pages
+  pil_format, extension = IMAGE_FORMATS[fmt]
+  save_options = {"quality": quality} if quality is not None and fmt != "png" else {}
+
+  # pdftoppm writes <prefix>-<page>.png, with the page number zero-padded
+  prefix = Path(output_folder) / f".pdftoppm-{first}"
+  command = ["pdftoppm", "-png", "-r", str(dpi), "-f", str(first), "-l", str(last)]
+  if password is not None:
+    command.extend(["-upw", password])
+  command.extend([input, str(prefix)])
+
+  result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+  if result.returncode != 0:
+    raise RuntimeError(result.stderr.decode("utf8", "ignore").strip() or f"pdftoppm exited with {result.returncode}")
+
+  for rendered in sorted(Path(output_folder).glob(f"{prefix.name}-*.png")):
+    page_number = int(rendered.stem.rsplit("-", 1)[1])
+    output = Path(output_folder) / f"page_{page_number}.{extension}"
+
+    if fmt == "png":
+      rendered.replace(output)
+      continue
+
+    with Image.open(rendered) as image:
+      image.save(output, pil_format, **save_options)
+    rendered.unlink()
@@ -1,7 +1,5 @@
-from pypdf import PdfWriter
-import rich
-from pdfcli.utils.page_utils import check_output, read_pdf
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from pdfcli.utils.cli_utils import rprint, spinner
+from pdfcli.utils.page_utils import check_output, read_pdf, write_pdf
 from pathlib import Path
 
 from pdfcli.utils.validators import exit_with_error_message
@@ -13,30 +11,25 @@ Example:\n
 pdfcli decrypt file.pdf -o output.pdf -p password1
 """
 
-def execute(input: str, output: str, password: str, remove_source: bool = False) -> None:
+def execute(input: str, output: str, password: str, remove_source: bool = False,
+  object_streams: bool = False) -> None:
+  from pypdf import PdfWriter
 
   output = check_output(output)
   reader = read_pdf(input, password=password)
   
-  with Progress(
-    SpinnerColumn(),
-    TextColumn("[progress.description]{task.description}"),
-    transient=True
-  ) as progress:
-    progress.add_task(description="Decrypting...", total=None)
-
+  with spinner("Decrypting..."):
     try:
       writer = PdfWriter(clone_from=reader)
 
       if reader.metadata: # preserve metadata
         writer.add_metadata(reader.metadata)
       
-      with open(output, "wb") as f:
-        writer.write(f)
+      write_pdf(writer, output, object_streams=object_streams)
     except Exception as e:
       exit_with_error_message(f"Failed to decrypt PDF: {e}")
     
     if remove_source:
       Path(input).unlink()
 
-  rich.print(f"[green]Decrypted and saved to {output}[/green]")
\ No newline at end of file
+  rprint(f"Decrypted and saved to {output}", status=0)
\ No newline at end of file
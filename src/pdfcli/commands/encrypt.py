@@ -1,8 +1,5 @@
-
-from pypdf import PdfWriter
-import rich
-from pdfcli.utils.page_utils import check_output, read_pdf
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from pdfcli.utils.cli_utils import rprint, spinner
+from pdfcli.utils.page_utils import check_output, read_pdf, write_pdf
 from pathlib import Path
 
 from pdfcli.utils.validators import exit_with_error_message
@@ -17,19 +14,14 @@ pdfcli encrpyt file.pdf -o output.pdf -a AES-256-R5 -p password1
 DEFAULT_ALGORITHM = "AES-256-R5"
 
 def execute(input: str, output: str, password: str, 
-  algorithm: str = DEFAULT_ALGORITHM, remove_source: bool = False) -> None:
+  algorithm: str = DEFAULT_ALGORITHM, remove_source: bool = False, object_streams: bool = False) -> None:
+  from pypdf import PdfWriter
 
   output = check_output(output)
 
   reader = read_pdf(input)
   
-  with Progress(
-    SpinnerColumn(),
-    TextColumn("[progress.description]{task.description}"),
-    transient=True
-  ) as progress:
-    progress.add_task(description="Encrpyting...", total=None)
-
+  with spinner("Encrpyting..."):
     try:
       writer = PdfWriter(clone_from=reader)
       writer.encrypt(password, algorithm=algorithm)
@@ -37,12 +29,11 @@ def execute(input: str, output: str, password: str,
       if reader.metadata: # preserve metadata
         writer.add_metadata(reader.metadata)
       
-      with open(output, "wb") as f:
-        writer.write(f)
+      write_pdf(writer, output, object_streams=object_streams)
     except Exception as e:
       exit_with_error_message(f"Failed to encrypt PDF: {e}")
     
     if remove_source:
       Path(input).unlink()
 
-  rich.print(f"[green]Encrypted and saved to {output}[/green]")
+  rprint(f"Encrypted and saved to {output}", status=0)
@@ -1,32 +1,76 @@
-from typing import List
-from pypdf import PdfWriter
-import rich
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from typing import TYPE_CHECKING, Iterable, List
 
-from pdfcli.utils.page_utils import check_output, read_pdf
+from pdfcli.utils.cli_utils import rprint, spinner
+from pdfcli.utils.page_utils import PdfSession, check_output, gather_inputs, write_pdf
+from pdfcli.utils.validators import exit_with_error_message
+
+if TYPE_CHECKING:
+  from pypdf import PdfReader, PdfWriter
+  from pdfcli.utils.dedupe import ObjectIndex
 
 description = """
   Merge multiple PDF files into one.\n
+  Identical fonts, images and other resources shared between inputs are only stored once.\n
+  Inputs can also be listed in a manifest file (--manifest), one path per line.\n
+  Inputs are parsed ahead of time by --jobs worker threads while pages are added in order.\n
+  For thousands of inputs, --low-memory writes each input out as soon as it is added,
+  so only a few inputs are held in memory at a time.\n
   Example:\n
-    pdfcli merge file1.pdf file2.pdf -o merged.pdf
+    pdfcli merge file1.pdf file2.pdf -o merged.pdf\n
+    pdfcli merge --manifest inputs.txt -o merged.pdf --low-memory
   """
 
-def execute(inputs: List[str], output: str) -> None:
+def execute(inputs: List[str], output: str, object_streams: bool = False,
+  manifest: str | None = None, low_memory: bool = False, jobs: int = 1) -> None:
+  from contextlib import nullcontext
+  from pypdf import PdfWriter
+  from pdfcli.utils.dedupe import ObjectIndex
+  from pdfcli.utils.workers import check_jobs, create_executor, ordered_map
+
+  check_jobs(jobs)
+  inputs = gather_inputs(inputs, manifest)
+
+  if low_memory and object_streams:
+    exit_with_error_message("--low-memory can't be combined with --object-streams.")
 
   writer = PdfWriter()
+  index = ObjectIndex(writer)
   output = check_output(output)
   
-  with Progress(
-    SpinnerColumn(),
-    TextColumn("[progress.description]{task.description}"),
-    transient=True
-  ) as progress:
-    progress.add_task(description="Merging...", total=None)
-    for pdf in inputs:
-      reader = read_pdf(pdf)
+  # With --jobs, inputs are parsed by the pool a few files ahead of the writer, which adds
+  # their pages strictly in input order. Parsing runs in threads because readers can't be
+  # handed between processes. Without a pool each input is read as its pages are added.
+  with spinner("Merging..."), create_executor(jobs, "thread") or nullcontext() as pool:
+    load = preload_input if pool is not None else PdfSession
+    readers = (session.reader for session in ordered_map(pool, load, inputs, lookahead=jobs * 2))
+
+    if low_memory:
+      merge_streaming(writer, index, readers, output)
+    else:
+      for reader in readers:
+        for page in reader.pages:
+          writer.add_page(page)
+        # merge fonts, images and other resources identical to ones already added
+        index.update()
+      write_pdf(writer, output, object_streams=object_streams)
+      
+  rprint(f"Successfully merged into {output}", status=0)
+
+def preload_input(pdf: str) -> PdfSession:
+  return PdfSession(pdf).preload()
+
+# Write each input's objects to the output right after it is added, then let its reader go.
+# Only the inputs parsed ahead by the pool are held in memory. The page tree and resource
+# hashes are all that grow with the number of inputs.
+def merge_streaming(writer: "PdfWriter", index: "ObjectIndex", readers: Iterable["PdfReader"], output: str) -> None:
+  from pdfcli.utils.streaming import StreamingWriter
+
+  with open(output, "wb") as f:
+    streaming = StreamingWriter(writer, f)
+    for reader in readers:
       for page in reader.pages:
         writer.add_page(page)
-    with open(output, "wb") as f:
-      writer.write(f)
-      
-  rich.print(f"[green]Successfully merged into {output}[/green]")
\ No newline at end of file
+      index.update()
+      streaming.release(reader)
+      streaming.flush()
+    streaming.close()
@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+from typing import List, Tuple
+
+from pdfcli.commands.compress import check_options, compress_writer
+from pdfcli.commands.encrypt import DEFAULT_ALGORITHM
+from pdfcli.commands.trim import copy_pages
+from pdfcli.utils.cli_utils import rprint, spinner
+from pdfcli.utils.page_utils import check_output, open_pdf, select_pages, write_pdf
+from pdfcli.utils.validators import exit_with_error_message
+
+description = """
+Decrypt, trim, compress and encrypt a PDF in one go.\n
+The input is parsed once, every step changes the same document in memory, and the result is
+written once at the end, instead of one full read and write per command.\n
+Steps run in that order. Only the steps whose options are given run: --password for an encrypted input,
+--trim, --compress and --encrypt. --level, --max-dpi and --jobs need --compress. Use --verbose to see how long each step takes.\n
+Example:\n
+pdfcli pipeline input.pdf -o output.pdf -p oldpass --trim 1-5 --compress low --encrypt newpass -V
+"""
+
+def execute(input: str, output: str, password: str | None = None, pages: str | None = None,
+  quality: str | None = None, level: int | None = None, max_dpi: int | None = None, jobs: int = 1,
+  encrypt_password: str | None = None, algorithm: str = DEFAULT_ALGORITHM,
+  object_streams: bool = False, verbose: bool = False) -> None:
+  from time import perf_counter
+  from pypdf import PdfWriter
+  from pdfcli.utils.workers import check_jobs
+
+  check_jobs(jobs)
+  # options of the compress step do nothing on their own, so don't let them be ignored quietly
+  if quality is None and (level is not None or max_dpi is not None or jobs > 1):
+    exit_with_error_message("--level, --max-dpi and --jobs only apply to --compress. Add --compress to use them.")
+
+  if level is None:
+    level = 6
+
+  output = check_output(output)
+  quality_value = check_options(quality, level, max_dpi) if quality is not None else None
+
+  timings: List[Tuple[str, float]] = []
+
+  @contextmanager
+  def stage(name: str):
+    start = perf_counter()
+    yield
+    timings.append((name, perf_counter() - start))
+
+  with stage("decrypt" if password else "open"):
+    reader = open_pdf(input, password=password).reader
+
+  page_order = select_pages(pages, len(reader.pages), dups=True) if pages else None
+
+  with spinner("Running pipeline..."):
+    try:
+      with stage("trim" if page_order is not None else "copy"):
+        writer = copy_pages(reader.pages, page_order) if page_order is not None else PdfWriter(clone_from=reader)
+
+        if reader.metadata: # preserve metadata
+          writer.add_metadata(reader.metadata)
+
+      if quality is not None:
+        with stage("compress"):
+          compress_writer(writer, level=level, quality=quality_value, jobs=jobs, verbose=verbose, max_dpi=max_dpi)
+
+      if encrypt_password:
+        with stage("encrypt"):
+          writer.encrypt(encrypt_password, algorithm=algorithm)
+
+      with stage("write"):
+        write_pdf(writer, output, object_streams=object_streams)
+    except Exception as e:
+      exit_with_error_message(f"Pipeline failed: {e}")
+
+  if verbose:
+    for name, seconds in timings:
+      rprint(f"{name}: {seconds:.2f}s")
+    rprint(f"total: {sum(seconds for _, seconds in timings):.2f}s")
+
+  rprint(f"Saved to {output}", status=0)
@@ -1,44 +1,106 @@
-import rich
-from pypdf import PdfWriter
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from typing import TYPE_CHECKING, Iterable
 
-from pdfcli.utils.page_utils import add_remaining_pages, check_output, parse_page_ranges, read_pdf
-from pdfcli.utils.validators import exit_with_error_message, page_validator
+from pdfcli.utils.cli_utils import rprint, spinner
+from pdfcli.utils.page_tree import INHERITABLE
+from pdfcli.utils.page_utils import add_remaining_pages, check_output, read_pdf, select_pages, write_pdf
+from pdfcli.utils.validators import exit_with_error_message
+
+if TYPE_CHECKING:
+  from pdfcli.utils.incremental import IncrementalUpdate
 
 description = """
   Reorder PDF pages.\n
   Duplicates are ignored, only the first occurance is used. Pages not specified in the order will be appended at the end in their original sequence.
   Use "trim" instead if you want to keep only the specified pages.\n
+  With --incremental, the original file is kept byte for byte and only a new page tree is appended to it,
+  which is much faster for large files. Pass the input as the output to update it in place.\n
   Example:\n
   pdfcli input.pdf -o output.pdf -r 3,1,2
   """
 
-
 # Reorder PDF
-def execute(input: str, output: str, order: str) -> None:
+def execute(input: str, output: str, order: str, object_streams: bool = False, incremental: bool = False,
+  mmap: bool = False) -> None:
+  from pypdf import PdfWriter
+
+  if incremental:
+    if object_streams:
+      exit_with_error_message("--incremental can't be combined with --object-streams.")
+    return execute_incremental(input, output, order, mmap)
 
-  reader = read_pdf(input)
+  reader = read_pdf(input, mmap=mmap)
   writer = PdfWriter()
 
   output = check_output(output)
   total_pages = len(reader.pages)
-  page_order = add_remaining_pages(
-    parse_page_ranges(order, subtract_one=True),
-    total_pages)
-
-  if not page_validator(page_order, total_pages):
-    exit_with_error_message("Page is out of range.")
-
-  with Progress(
-    SpinnerColumn(),
-    TextColumn("[progress.description]{task.description}"),
-    transient=True
-  ) as progress:
-    progress.add_task(description="Changing orders...", total=None)
+  page_order = add_remaining_pages(select_pages(order, total_pages), total_pages)
+
+  with spinner("Changing orders..."):
     for idx in page_order:
       writer.add_page(reader.pages[idx])
 
-    with open(output, "wb") as f:
-      writer.write(f)
+    write_pdf(writer, output, object_streams=object_streams)
+
+  rprint(f"Reordered and saved to {output}", status=0)
+
+def execute_incremental(input: str, output: str, order: str, mmap: bool = False) -> None:
+  from pdfcli.utils.incremental import IncrementalUpdate
+
+  output = check_output(output)
+
+  with IncrementalUpdate(input, mmap=mmap) as update:
+    total_pages = len(update.reader.pages)
+    page_order = add_remaining_pages(select_pages(order, total_pages), total_pages)
+
+    with spinner("Changing orders..."):
+      set_page_order(update, page_order)
+      update.save(output)
+
+  rprint(f"Reordered and saved to {output}", status=0)
+
+# Replace the page tree with a single node listing the pages in the given order.
+# Pages that hung below other nodes are moved up to the root, taking along anything
+# they inherited from those nodes. Nothing but page tree dictionaries is rewritten.
+def set_page_order(update: "IncrementalUpdate", page_order: Iterable[int]) -> None:
+  from pypdf.generic import ArrayObject, DictionaryObject, NameObject, NumberObject
+
+  reader = update.reader
+  root_ref = reader.root_object.raw_get("/Pages")
+  root_node = root_ref.get_object()
+
+  kids = ArrayObject()
+  for idx in page_order:
+    page = reader.pages[idx]
+    reference = page.indirect_reference
+    kids.append(reference)
+
+    parent = page.raw_get("/Parent") if "/Parent" in page else None
+    if parent is not None and parent.idnum == root_ref.idnum:
+      continue
+
+    # pypdf copies inherited values into each page when it reads the page tree. Put back the
+    # ancestor's reference instead, so shared resources aren't written out inline for every page.
+    moved = DictionaryObject(page)
+    found = set()
+    ancestor = parent
+    while ancestor is not None and ancestor.idnum != root_ref.idnum:
+      node = ancestor.get_object()
+      for key in INHERITABLE:
+        if key in node and key not in found:
+          found.add(key)
+          if key not in moved or moved.raw_get(key) is node[key]:
+            moved[NameObject(key)] = node.raw_get(key)
+      ancestor = node.raw_get("/Parent") if "/Parent" in node else None
+
+    # values from the root are still inherited through the new parent
+    for key in INHERITABLE:
+      if key not in found and key in root_node and key in moved and moved.raw_get(key) is root_node[key]:
+        del moved[key]
+
+    moved[NameObject("/Parent")] = root_ref
+    update.set_object(reference, moved)
 
-  rich.print(f"[green]Reordered and saved to {output}[/green]")
\ No newline at end of file
+  root = DictionaryObject(root_node)
+  root[NameObject("/Kids")] = kids
+  root[NameObject("/Count")] = NumberObject(len(kids))
+  update.set_object(root_ref, root)
@@ -1,42 +1,121 @@
-from pypdf import PdfWriter
-import rich
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from typing import TYPE_CHECKING, Iterable, Iterator, Sequence, Tuple
+import typer
 
-from pdfcli.utils.page_utils import create_path, parse_page_ranges, read_pdf
-from pdfcli.utils.validators import exit_with_error_message, page_validator
+from pdfcli.utils.cli_utils import rprint, spinner
+from pdfcli.utils.page_tree import page_source
+from pdfcli.utils.page_utils import PdfSession, create_path, open_pdf, select_pages, write_pdf
+from pdfcli.utils.validators import exit_with_error_message
+
+if TYPE_CHECKING:
+  from pypdf import PageObject
 
 
 description= """
 Split the PDF into multiple PDFs.\n
 Separate a page or a range from the main PDF. Pages can repeat for each split. Does not support reverse pages, or compiling different pages into one. Use the 'trim' function instead.\n
 Separate each split with a comma (,).\n
+Use --every N instead of parts to split into consecutive N-page parts, or --burst for one PDF per page.\n
+Use --max-size (e.g. 10MB) to fit as many consecutive pages in each part as the size allows. Sizes are
+estimated from the pages' objects, counting shared fonts and images once per part.
+A page bigger than the limit on its own gets its own part.\n
+Parts can be written in parallel with --jobs. Each worker process reads the input once.\n
 Example (will create 3 PDFs):\n
 pdfcli split input.pdf -o out_pdfs -p 1-5,3-6,7\n
+pdfcli split input.pdf -o out_pdfs --every 10\n
+pdfcli split input.pdf -o out_pdfs --max-size 10MB\n
 """
 
 # Split PDF
-def execute(input: str, output_folder: str, parts: str) -> None:
+def execute(input: str, output_folder: str, parts: str | None = None, object_streams: bool = False, jobs: int = 1,
+  every: int | None = None, burst: bool = False, max_size: str | None = None, mmap: bool = False) -> None:
+  from contextlib import nullcontext
+  from functools import partial
+  from pdfcli.utils.workers import check_jobs, create_executor, ordered_map
+
+  check_jobs(jobs)
+
+  if burst:
+    if every is not None:
+      exit_with_error_message("Use either --every or --burst, not both.")
+    every = 1
+
+  if max_size is not None:
+    from pdfcli.utils.size_utils import parse_size
+
+    if every is not None:
+      exit_with_error_message("Use either --max-size or --every/--burst, not both.")
+    try:
+      limit = parse_size(max_size)
+    except ValueError as e:
+      exit_with_error_message(f"{e}. Use a number with an optional unit, e.g. 10MB.")
+
+  if every is not None or max_size is not None:
+    if parts:
+      exit_with_error_message("Use either parts or --every/--burst/--max-size, not both.")
+    if every is not None and every < 1:
+      exit_with_error_message("--every must be at least 1.")
+  elif not parts:
+    parts = typer.prompt("Parts (e.g 1-5,3-6,7)")
 
   output_folder = create_path(output_folder, default="out_pdfs")
 
-  reader = read_pdf(input)
-
-  groupings = [parse_page_ranges(part, subtract_one=True, dups=False) for part in parts.split(',')]
-
-  for group in groupings:
-    if not page_validator(group, len(reader.pages)):
-      exit_with_error_message("Page is out of range.")
-
-  with Progress(
-    SpinnerColumn(),
-    TextColumn("[progress.description]{task.description}"),
-    transient=True
-  ) as progress:
-    progress.add_task(description="Splitting...", total=None)
-    for index, pages in enumerate(groupings, start=1):
-      writer = PdfWriter()
-      for page in pages:
-        writer.add_page(reader.pages[page])
-      writer.write(f"{output_folder}/output-{index}.pdf")
+  document = open_pdf(input, mmap=mmap)
+  reader = document.reader
+  # parts given as page ranges are picked from the page tree, the other modes use every page
+  by_tree = every is None and max_size is None
+  document_pages = page_source(reader) if by_tree else reader.pages
+  total_pages = len(document_pages)
+
+  if every is not None:
+    groupings = every_groups(total_pages, every)
+  elif max_size is not None:
+    from pdfcli.utils.size_utils import pack_pages
+
+    with spinner("Measuring pages..."):
+      groupings = pack_pages(document_pages, limit)
+  else:
+    groupings = [select_pages(part, total_pages) for part in parts.split(',')]
+
+  tasks = ((f"{output_folder}/output-{index}.pdf", pages) for index, pages in enumerate(groupings, start=1))
+
+  # Workers open the input once each (open_source) and then write whole parts,
+  # so only output file names and page numbers are sent between processes.
+  pool = create_executor(jobs, initializer=open_source, initargs=(document.path, document.password, mmap, by_tree))
+
+  with spinner("Splitting..."), pool or nullcontext():
+    if pool is None:
+      for output, pages in tasks:
+        write_part(document_pages, output, pages, object_streams=object_streams)
+    else:
+      write = partial(write_source_part, object_streams=object_streams)
+      for _ in ordered_map(pool, write, tasks, lookahead=jobs * 2):
+        pass
   
-  rich.print(f"[green]Successfully split into {output_folder}/[/green]")
+  rprint(f"Successfully split into {output_folder}/", status=0)
+
+# Consecutive parts of size pages each, the last one possibly shorter. Built lazily from the
+# page count, so nothing has to be parsed or validated per page.
+def every_groups(total_pages: int, size: int) -> Iterator[range]:
+  for start in range(0, total_pages, size):
+    yield range(start, min(start + size, total_pages))
+
+def write_part(document_pages: Sequence["PageObject"], output: str, pages: Iterable[int], *,
+  object_streams: bool = False) -> None:
+  from pypdf import PdfWriter
+
+  writer = PdfWriter()
+  for page in pages:
+    writer.add_page(document_pages[page])
+  write_pdf(writer, output, object_streams=object_streams)
+
+# The pages of the input as opened by this worker process.
+source = None
+
+def open_source(path: str, password: str | None, mmap: bool, by_tree: bool) -> None:
+  global source
+  reader = PdfSession(path, password=password, mmap=mmap).reader
+  source = page_source(reader) if by_tree else reader.pages
+
+def write_source_part(task: Tuple[str, Iterable[int]], *, object_streams: bool = False) -> None:
+  output, pages = task
+  write_part(source, output, pages, object_streams=object_streams)
@@ -1,10 +1,11 @@
+from typing import TYPE_CHECKING, Iterable, Sequence
 
-from pypdf import PdfWriter
-import rich
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from pdfcli.utils.cli_utils import rprint, spinner
+from pdfcli.utils.page_tree import page_source
+from pdfcli.utils.page_utils import check_output, read_pdf, select_pages, write_pdf
 
-from pdfcli.utils.page_utils import check_output, parse_page_ranges, read_pdf
-from pdfcli.utils.validators import exit_with_error_message, page_validator
+if TYPE_CHECKING:
+  from pypdf import PageObject, PdfWriter
 
 description = """
   Trim or reorder pages of a PDF using page range syntax.\n
@@ -15,27 +16,25 @@ description = """
   """
 
 # Trim PDFs
-def execute(input: str, output: str, pages: str) -> None:
-  
-  reader =  read_pdf(input)
-  writer = PdfWriter()
+def execute(input: str, output: str, pages: str, object_streams: bool = False, mmap: bool = False) -> None:
+  reader =  read_pdf(input, mmap=mmap)
+  document_pages = page_source(reader)
 
-  page_order = parse_page_ranges(pages, dups=True, subtract_one=True)
+  page_order = select_pages(pages, len(document_pages), dups=True)
   output = check_output(output)
-
-  if not page_validator(page_order,len(reader.pages)):
-    exit_with_error_message("Page is out of range.")
   
-  with Progress(
-    SpinnerColumn(),
-    TextColumn("[progress.description]{task.description}"),
-    transient=True
-  ) as progress:
-    progress.add_task(description="Trimming...", total=None)
-    for idx in page_order:
-      writer.add_page(reader.pages[idx])
-
-    with open(output, "wb") as f:
-      writer.write(f)
+  with spinner("Trimming..."):
+    writer = copy_pages(document_pages, page_order)
+    write_pdf(writer, output, object_streams=object_streams)
       
-  rich.print(f"[green]Trimmed and saved to {output}[/green]")
\ No newline at end of file
+  rprint(f"Trimmed and saved to {output}", status=0)
+
+# A new document with the given pages of a document, in that order. Shared with the pipeline command.
+def copy_pages(document_pages: Sequence["PageObject"], pages: Iterable[int]) -> "PdfWriter":
+  from pypdf import PdfWriter
+
+  writer = PdfWriter()
+  for idx in pages:
+    writer.add_page(document_pages[idx])
+
+  return writer
@@ -3,7 +3,25 @@ import typer
 from typing_extensions import Annotated
 
 from pdfcli import __version__
-from pdfcli.commands import compress, merge, convert, reorder, trim, split, decrypt, encrypt
+# Command modules only hold descriptions and defaults at import time. Their heavy
+# dependencies (pypdf, PIL, pdf2image, rich) are imported inside each command's
+# execute function, so --version and --help stay fast.
+from pdfcli.commands import analyze, batch, compress, merge, convert, pipeline, reorder, trim, split, decrypt, encrypt
+
+# Shared by every command that writes a PDF
+ObjectStreamsOption = Annotated[bool, typer.Option(
+  "--object-streams", help="Pack objects into compressed object streams (PDF 1.5+). Smaller output for object-heavy files.",
+  )]
+
+# Shared by every command that accepts multiple input files
+ManifestOption = Annotated[str, typer.Option(
+  ..., "-m", "--manifest", help="Text file listing input files, one per line. Blank lines and lines starting with '#' are skipped.",
+  )]
+
+# Shared by commands that read a single input PDF and may only need part of it
+MmapOption = Annotated[bool, typer.Option(
+  "--mmap", help="Memory-map the input instead of reading it all into memory. Only the parts that are used get loaded. Useful for very large files when only some pages are needed.",
+  )]
 
 app = typer.Typer(help=
   """A simple PDF CLI tool.\n
@@ -16,23 +34,38 @@ app = typer.Typer(help=
 
 # Merge PDFs
 @app.command(help=merge.description, name="merge")
-def merge_command(inputs: Annotated[List[str], typer.Argument(help="Input PDF files. Space-separated. Use quotes for paths with spaces.")],
+def merge_command(inputs: Annotated[List[str], typer.Argument(help="Input PDF files. Space-separated. Use quotes for paths with spaces.")] = None,
   output: Annotated[str, typer.Option(
       ...,"-o", "--output", help="Output PDF file (path + filename).",
       prompt="Output file name"
-  )]):
+  )] = None,
+  object_streams: ObjectStreamsOption = False,
+  manifest: ManifestOption = None,
+  low_memory: Annotated[bool, typer.Option(
+    "--low-memory", help="Write each input out as soon as it is added. Keeps memory flat for thousands of inputs.",
+    )] = False,
+  jobs: Annotated[int, typer.Option(
+    ..., "-j", "--jobs", help="Number of worker threads used to parse inputs ahead of merging.",
+    )] = 1):
   
-  merge.execute(inputs, output)
+  merge.execute(inputs, output, object_streams, manifest, low_memory, jobs)
 
 # Images to PDF
 @app.command(help=convert.img2pdf_desc, name="img2pdf")
-def img2pdf_command(images: Annotated[List[str], typer.Argument(help="Input image files. Space-separated. Use quotes for paths with spaces.")], 
+def img2pdf_command(images: Annotated[List[str], typer.Argument(help="Input image files. Space-separated. Use quotes for paths with spaces.")] = None, 
   output: Annotated[str, typer.Option(
       ..., "-o", "--output", help="Output PDF file (path + filename).",
       prompt="Output file name"
-  )]):
+  )] = None,
+  jobs: Annotated[int, typer.Option(
+    ..., "-j", "--jobs", help="Number of workers used to prepare images.",
+    )] = 1,
+  executor: Annotated[str, typer.Option(
+    ..., "-e", "--executor", help="Run workers as 'thread' or 'process'.",
+    )] = "thread",
+  manifest: ManifestOption = None):
 
-  convert.img2pdf_execution(images, output)
+  convert.img2pdf_execution(images, output, jobs, executor, manifest)
 
 # PDF to images
 @app.command(help=convert.pdf2img_desc, name="pdf2img")
@@ -40,9 +73,24 @@ def pdf2img_command(input: Annotated[str, typer.Argument(help="Input PDF file. U
   output_folder: Annotated[str, typer.Option(
     ..., "-o", "--output", help="Output file location.",
     prompt="Output folder name"
-    )] = "out_images"):
+    )] = "out_images",
+  jobs: Annotated[int, typer.Option(
+    ..., "-j", "--jobs", help="Number of worker processes used to render pages.",
+    )] = 1,
+  pages: Annotated[str, typer.Option(
+    ..., "-p", "--page", help="Pages to convert. Please don't add any spaces. e.g. '1-5,9'. Defaults to all pages.",
+    )] = None,
+  dpi: Annotated[int, typer.Option(
+    ..., "--dpi", help="Resolution of the rendered images.",
+    )] = convert.DEFAULT_DPI,
+  fmt: Annotated[str, typer.Option(
+    ..., "-f", "--format", help="Image format: png, jpeg or webp.",
+    )] = "png",
+  quality: Annotated[int, typer.Option(
+    ..., "-q", "--quality", help="Image quality for jpeg and webp (1-100).",
+    )] = None):
   
-  convert.pdf2img_execution(input, output_folder)
+  convert.pdf2img_execution(input, output_folder, jobs, pages, dpi, fmt, quality)
 
 # Reorder PDF pages
 @app.command(help=reorder.description, name="reorder")
@@ -54,9 +102,14 @@ def reorder_command(input: Annotated[str, typer.Argument(help="Input PDF file. U
   order: Annotated[str, typer.Option(
     ..., "-r", "--order", help="Order of input files by their index",
     prompt="Pages order (e.g: 3,1,2)"
-  )]):
+  )],
+  object_streams: ObjectStreamsOption = False,
+  incremental: Annotated[bool, typer.Option(
+    "--incremental", help="Keep the original bytes and append only a new page tree. Much faster for large files.",
+    )] = False,
+  mmap: MmapOption = False):
 
-  reorder.execute(input, output, order)
+  reorder.execute(input, output, order, object_streams, incremental, mmap)
 
 # Trim PDF
 @app.command(help=trim.description, name="trim")
@@ -68,24 +121,39 @@ def trim_command(input: Annotated[str, typer.Argument(help="Input PDF file. Use
   pages: Annotated[str, typer.Option(
     ..., "-p", "--page", help="Pages to keep. Please don't add any spaces. e.g. '1-5,7,10-12,9'",
     prompt="Pages (e.g. 1-5,7,10-12,9)"
-  )]):
+  )],
+  object_streams: ObjectStreamsOption = False,
+  mmap: MmapOption = False):
 
-  trim.execute(input, output, pages)
+  trim.execute(input, output, pages, object_streams, mmap)
 
 # Split PDF
 @app.command(help=split.description, name="split")
 def split_command(input: Annotated[str, typer.Argument(help="Input PDF file. Use quotes for path with spaces.")],
   parts: Annotated[str, typer.Option(
     ..., "--part","-p",
-    help="Page or range to split. Please don't add any spaces. e.g '1-5,3-6,7'",
-    prompt= "Parts (e.g 1-5,3-6,7)"
-    )],
+    help="Page or range to split. Please don't add any spaces. e.g '1-5,3-6,7'. Asked for if --every and --burst aren't used.",
+    )] = None,
   output_folder: Annotated[str, typer.Option(
     ..., "-o", "--output", help="Output file location.",
     prompt="Output folder name"
-    )] = "out_pdfs"):
+    )] = "out_pdfs",
+  object_streams: ObjectStreamsOption = False,
+  jobs: Annotated[int, typer.Option(
+    ..., "-j", "--jobs", help="Number of worker processes used to write parts.",
+    )] = 1,
+  every: Annotated[int, typer.Option(
+    ..., "--every", help="Split into parts of this many consecutive pages.",
+    )] = None,
+  burst: Annotated[bool, typer.Option(
+    "--burst", help="Split into one PDF per page. Same as --every 1.",
+    )] = False,
+  max_size: Annotated[str, typer.Option(
+    ..., "--max-size", help="Split into parts of consecutive pages no bigger than this, e.g. 10MB.",
+    )] = None,
+  mmap: MmapOption = False):
   
-  split.execute(input, output_folder, parts)
+  split.execute(input, output_folder, parts, object_streams, jobs, every, burst, max_size, mmap)
 
 # Encrypt PDF
 @app.command(help=encrypt.description, name="encrypt")
@@ -106,9 +174,10 @@ def encrypt_command(input: Annotated[str, typer.Argument(help="Input PDF file. U
   remove_source: Annotated[bool, typer.Option(
     ..., "-rm", "--remove-source", help="Remove the original PDF after processing.",
     metavar="remove-source",
-  )] = False):
+  )] = False,
+  object_streams: ObjectStreamsOption = False):
   
-  encrypt.execute(input, output, password, algorithm, remove_source)
+  encrypt.execute(input, output, password, algorithm, remove_source, object_streams)
 
 # Decrypt PDF
 @app.command(help=decrypt.description, name="decrypt")
@@ -125,9 +194,10 @@ def decrypt_command(input: Annotated[str, typer.Argument(help="Input PDF file. U
   remove_source: Annotated[bool, typer.Option(
     ..., "-rm", "--remove-source", help="Remove the original PDF after processing.",
     metavar="remove-source",
-  )] = False):
+  )] = False,
+  object_streams: ObjectStreamsOption = False):
   
-  decrypt.execute(input, output, password, remove_source)
+  decrypt.execute(input, output, password, remove_source, object_streams)
 
 # Compress PDF
 @app.command(help=compress.description, name="compress")
@@ -144,9 +214,86 @@ def compress_command(input: Annotated[str, typer.Argument(help="Input PDF files.
     ...,"--level","-l", 
     help="Level of compression. Range is between 0 to 9, where 0 is no compression, and 9 is highest compression.",
   )] = 6,
+  jobs: Annotated[int, typer.Option(
+    ..., "-j", "--jobs", help="Number of worker processes used to recompress images.",
+    )] = 1,
+  verbose: Annotated[bool, typer.Option(
+    ..., "-V", "--verbose", help="Show details about the compression.",
+  )] = False,
+  max_dpi: Annotated[int, typer.Option(
+    ..., "--max-dpi", help="Downsample images drawn above this resolution.",
+  )] = None,
+  object_streams: ObjectStreamsOption = False,
   ):
   
-  compress.execute(input, output, level, quality)
+  compress.execute(input, output, level, quality, jobs, verbose, max_dpi, object_streams)
+
+# Analyze PDF
+@app.command(help=analyze.description, name="analyze")
+def analyze_command(input: Annotated[str, typer.Argument(help="Input PDF file. Use quotes for path with spaces.")],
+  top: Annotated[int, typer.Option(
+    ..., "-t", "--top", help="Number of biggest objects to list.",
+  )] = 10,
+  sample: Annotated[int, typer.Option(
+    ..., "-s", "--sample", help="Number of largest images recompressed to estimate savings.",
+  )] = 5):
+
+  analyze.execute(input, top, sample)
+
+# Chain steps on one PDF
+@app.command(help=pipeline.description, name="pipeline")
+def pipeline_command(input: Annotated[str, typer.Argument(help="Input PDF file. Use quotes for path with spaces.")],
+  output: Annotated[str, typer.Option(
+    ..., "-o", "--output", help="Output PDF file (path + filename).",
+    prompt="Output file name"
+    )],
+  password: Annotated[str, typer.Option(
+    ..., "-p", "--password", help="Password of the input PDF, if it is encrypted. Asked for if missing.",
+    )] = None,
+  pages: Annotated[str, typer.Option(
+    ..., "-t", "--trim", help="Pages to keep, in trim's page range syntax. e.g. '1-5,7'.",
+    )] = None,
+  quality: Annotated[str, typer.Option(
+    ..., "-c", "--compress", help="Compress with this image quality, a compress preset or value. e.g. 'medium'.",
+    )] = None,
+  level: Annotated[int, typer.Option(
+    ..., "-l", "--level", help="Lossless compression level (0-9) used by --compress. Defaults to 6.",
+    )] = None,
+  max_dpi: Annotated[int, typer.Option(
+    ..., "--max-dpi", help="Downsample images drawn above this resolution when compressing.",
+    )] = None,
+  jobs: Annotated[int, typer.Option(
+    ..., "-j", "--jobs", help="Number of worker processes used to recompress images.",
+    )] = 1,
+  encrypt_password: Annotated[str, typer.Option(
+    ..., "-e", "--encrypt", help="Encrypt the output with this password.",
+    )] = None,
+  algorithm: Annotated[str, typer.Option(
+    ..., "-a", "--algorithm", help="The algorithm used by --encrypt.",
+    )] = encrypt.DEFAULT_ALGORITHM,
+  object_streams: ObjectStreamsOption = False,
+  verbose: Annotated[bool, typer.Option(
+    ..., "-V", "--verbose", help="Show how long each step takes.",
+    )] = False):
+
+  pipeline.execute(input, output, password, pages, quality, level, max_dpi, jobs,
+    encrypt_password, algorithm, object_streams, verbose)
+
+# Run a command over a folder
+@app.command(help=batch.description, name="batch",
+  context_settings={"allow_extra_args": True, "ignore_unknown_options": True})
+def batch_command(ctx: typer.Context,
+  command: Annotated[str, typer.Argument(help=f"Command to run: {', '.join(batch.BATCH_COMMANDS)}.")],
+  input_folder: Annotated[str, typer.Argument(help="Folder with the input PDF files. Use quotes for path with spaces.")],
+  output_folder: Annotated[str, typer.Option(
+    ..., "-o", "--output", help="Output folder.",
+    prompt="Output folder name"
+    )],
+  jobs: Annotated[int, typer.Option(
+    ..., "-j", "--jobs", help="Number of worker processes.",
+    )] = 1):
+
+  batch.execute(command, input_folder, output_folder, jobs, ctx.args)
 
 @app.callback(invoke_without_command=True)
 def main(version: Annotated[bool, typer.Option(
@@ -1,6 +1,17 @@
-from rich.console import Console
+from contextlib import contextmanager
 
-console = Console()
+# rich.console and rich.progress are only imported once something is printed,
+# keeping `pdfcli --version` and `--help` fast.
+_console = None
+
+def get_console():
+  global _console
+
+  if _console is None:
+    from rich.console import Console
+    _console = Console()
+
+  return _console
 
 def rprint(message: str,*, status: int | None = None) -> None:
 
@@ -9,4 +20,17 @@ def rprint(message: str,*, status: int | None = None) -> None:
     1: "red"
   }
 
-  console.print(message, style=styles[status])
\ No newline at end of file
+  get_console().print(message, style=styles.get(status))
+
+# Transient spinner shown while a command is working.
+@contextmanager
+def spinner(description: str):
+  from rich.progress import Progress, SpinnerColumn, TextColumn
+
+  with Progress(
+    SpinnerColumn(),
+    TextColumn("[progress.description]{task.description}"),
+    transient=True
+  ) as progress:
+    progress.add_task(description=description, total=None)
+    yield progress
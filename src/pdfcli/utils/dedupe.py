@@ -0,0 +1,158 @@
+# Content-hash index of a PdfWriter's objects, used to merge identical objects
+# (fonts, images, shared resources) as each input document is added.
+# Only what pages draw with is merged: their resources and content streams. Pages,
+# annotations and form fields stay distinct even when identical, since each of them
+# belongs to one page and viewers treat a shared one as a single object.
+from hashlib import sha256
+from io import BytesIO
+from typing import TYPE_CHECKING, Dict, Iterable, List, Set
+
+if TYPE_CHECKING:
+  from pypdf import PdfWriter
+  from pypdf.generic import IndirectObject, PdfObject
+
+# Page tree objects, which are never merged or looked into.
+PAGE_TYPES = ("/Page", "/Pages", "/Catalog")
+
+class ObjectIndex:
+
+  def __init__(self, writer: "PdfWriter") -> None:
+    self.writer = writer
+    self.hashes: Dict[bytes, "IndirectObject"] = {} # content hash -> first object with it
+    self.indexed = 0 # objects in writer._objects already in the index
+    self.removed = 0
+
+  # Index the objects added since the last call. Any that duplicate an indexed object,
+  # or each other, are dropped and references to them point at the kept copy instead.
+  # Repeats until nothing changes, so parents of merged objects are merged too.
+  def update(self) -> None:
+    objects = self.writer._objects
+    mergeable = self._mergeable(objects)
+
+    changed = set() # new objects that can be merged
+    kept = [] # new objects that are never merged but may point at merged ones
+    for index in range(self.indexed, len(objects)):
+      if objects[index] is None:
+        continue
+      if index in mergeable:
+        changed.add(index)
+      else:
+        kept.append(objects[index])
+
+    current = {} # index -> content hash, for new objects still in the writer
+
+    while changed:
+      for index in changed:
+        current[index] = content_hash(objects[index])
+
+      crossref = {} # merged object number -> kept reference
+      local = {}
+      for index in sorted(current):
+        key = current[index]
+        first = self.hashes.get(key) or local.get(key)
+        if first is None:
+          local[key] = objects[index].indirect_reference
+        else:
+          crossref[index + 1] = first
+
+      if not crossref:
+        break
+
+      for idnum in crossref:
+        objects[idnum - 1] = None
+        del current[idnum - 1]
+      self.removed += len(crossref)
+
+      for obj in kept:
+        replace_references(obj, crossref)
+      changed = {index for index in current if replace_references(objects[index], crossref)}
+
+    for index, key in current.items():
+      self.hashes[key] = objects[index].indirect_reference
+
+    self.indexed = len(objects)
+
+  # Indexes of the new objects that the new pages draw with, minus anything an
+  # annotation or form field uses.
+  def _mergeable(self, objects: List["PdfObject"]) -> Set[int]:
+    from pypdf.generic import DictionaryObject
+
+    pages = [
+      obj for obj in objects[self.indexed:]
+      if isinstance(obj, DictionaryObject) and obj.get("/Type") == "/Page"
+    ]
+    drawn = self._reachable(objects, (page.raw_get(key) for page in pages for key in ("/Resources", "/Contents") if key in page))
+
+    interactive = [page.raw_get("/Annots") for page in pages if "/Annots" in page]
+    if "/AcroForm" in self.writer.root_object:
+      interactive.append(self.writer.root_object.raw_get("/AcroForm"))
+
+    drawn -= self._reachable(objects, interactive)
+    return {index for index in drawn if not is_interactive(objects[index])}
+
+  # Indexes of the new objects reachable from roots, without going into the page tree.
+  def _reachable(self, objects: List["PdfObject"], roots: Iterable["PdfObject"]) -> Set[int]:
+    from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject
+
+    found = set()
+    pending = list(roots)
+    while pending:
+      obj = pending.pop()
+      if isinstance(obj, IndirectObject):
+        index = obj.idnum - 1
+        if index < self.indexed or index in found or objects[index] is None:
+          continue
+        obj = objects[index]
+        if not is_page_tree(obj):
+          found.add(index)
+
+      if is_page_tree(obj):
+        continue
+      if isinstance(obj, DictionaryObject):
+        pending.extend(obj.values())
+      elif isinstance(obj, ArrayObject):
+        pending.extend(obj)
+
+    return found
+
+def is_page_tree(obj: "PdfObject") -> bool:
+  from pypdf.generic import DictionaryObject
+
+  return isinstance(obj, DictionaryObject) and obj.get("/Type") in PAGE_TYPES
+
+# An annotation, widget or form field, wherever it is found.
+def is_interactive(obj: "PdfObject") -> bool:
+  from pypdf.generic import DictionaryObject
+
+  if not isinstance(obj, DictionaryObject):
+    return False
+  return obj.get("/Type") == "/Annot" or obj.get("/Subtype") == "/Widget" or "/FT" in obj
+
+def content_hash(obj: "PdfObject") -> bytes:
+  buffer = BytesIO()
+  buffer.write(type(obj).__name__.encode())
+  obj.write_to_stream(buffer)
+  return sha256(buffer.getvalue()).digest()
+
+# Point references to merged objects (by object number) at their kept copy.
+# Returns whether anything was replaced.
+def replace_references(obj: "PdfObject", crossref: Dict[int, "IndirectObject"]) -> bool:
+  from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject
+
+  if isinstance(obj, DictionaryObject):
+    items = list(obj.items())
+  elif isinstance(obj, ArrayObject):
+    items = list(enumerate(obj))
+  else:
+    return False
+
+  replaced = False
+  for key, value in items:
+    if isinstance(value, IndirectObject):
+      if value.idnum in crossref:
+        obj[key] = crossref[value.idnum]
+        replaced = True
+    elif replace_references(value, crossref):
+      replaced = True
+
+  return replaced
@@ -0,0 +1,225 @@
+# Minimal PDF writer for image-only documents.
+# Each page is written to the file as soon as it is added, so only one image
+# has to be held in memory no matter how many pages the document has.
+from io import BytesIO
+from typing import BinaryIO, List, NamedTuple, Optional
+
+CATALOG_ID = 1
+PAGES_ID = 2
+
+# An image already encoded the way it will be stored in the PDF.
+class EncodedImage(NamedTuple):
+  data: bytes
+  width: int
+  height: int
+  color_space: str # DeviceRGB, DeviceGray, ... (the base color space of a palette image)
+  filter: str # DCTDecode, FlateDecode, ...
+  bits: int = 8
+  palette: bytes = b"" # RGB palette of an indexed image
+  decode_parms: str = "" # entries of the filter's /DecodeParms dictionary
+  decode: str = "" # entries of the /Decode array
+
+# Start-of-frame markers for baseline, extended and progressive Huffman JPEGs.
+# Other frame types (lossless, arithmetic coding) are left to Pillow.
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2}
+
+JPEG_COLOR_SPACES = {
+  1: "DeviceGray",
+  3: "DeviceRGB"
+}
+
+# Read an image file and return it ready to embed, one image per frame (e.g. the pages
+# of a multi-page TIFF). Plain JPEGs are embedded as-is, everything else goes through Pillow.
+def load_image(path: str) -> List[EncodedImage]:
+  with open(path, "rb") as f:
+    data = f.read()
+
+  image = jpeg_passthrough(data)
+  if image is None:
+    return encode_image(BytesIO(data))
+
+  return [image]
+
+# Use the original JPEG bytes as a DCTDecode stream, reading only the header for the
+# size and number of components. Returns None if the file needs to go through Pillow.
+def jpeg_passthrough(data: bytes) -> Optional[EncodedImage]:
+  if not data.startswith(b"\xff\xd8"):
+    return None
+
+  pos = 2
+  while pos + 4 <= len(data):
+    if data[pos] != 0xFF:
+      return None
+
+    marker = data[pos + 1]
+    if marker == 0xFF: # fill byte
+      pos += 1
+      continue
+
+    length = int.from_bytes(data[pos + 2:pos + 4], "big")
+
+    if marker == 0xEE: # Adobe segment, CMYK/YCCK JPEGs need extra handling
+      return None
+
+    if marker in JPEG_SOF_MARKERS:
+      bits = data[pos + 4]
+      height = int.from_bytes(data[pos + 5:pos + 7], "big")
+      width = int.from_bytes(data[pos + 7:pos + 9], "big")
+      components = data[pos + 9]
+
+      if bits != 8 or components not in JPEG_COLOR_SPACES or not width or not height:
+        return None
+
+      return EncodedImage(data, width, height, JPEG_COLOR_SPACES[components], "DCTDecode")
+
+    if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC): # unsupported frame type
+      return None
+
+    if marker == 0xDA: # start of scan before any frame header
+      return None
+
+    pos += 2 + length
+
+  return None
+
+# Decode an image with Pillow and encode each of its frames, as Pillow's PDF writer does
+# with save_all.
+def encode_image(source) -> List[EncodedImage]:
+  from PIL import Image, ImageSequence
+
+  with Image.open(source) as im:
+    return [encode_frame(frame) for frame in ImageSequence.Iterator(im)]
+
+# Encode one frame the way Pillow's PDF writer stores its mode: 1-bit images as CCITT G4,
+# palette images losslessly as indexed colors, and grayscale, RGB and CMYK images as JPEG.
+# Transparency is dropped. 16-bit grayscale is scaled to 8 bits, other modes become RGB.
+def encode_frame(im) -> EncodedImage:
+  if im.mode == "1":
+    return encode_bilevel(im)
+  if im.mode in ("P", "PA"):
+    return encode_palette(im)
+
+  if im.mode == "LA":
+    im = im.convert("L")
+  elif im.mode == "I" or im.mode.startswith("I;16"):
+    im = scale_to_8_bits(im)
+  elif im.mode == "F":
+    raise ValueError("Floating-point images are not supported.")
+  elif im.mode not in ("L", "RGB", "CMYK"):
+    im = im.convert("RGB")
+
+  buffer = BytesIO()
+  im.save(buffer, "JPEG")
+
+  if im.mode == "CMYK":
+    # Pillow writes CMYK JPEGs inverted, as Adobe applications do
+    return EncodedImage(buffer.getvalue(), im.width, im.height, "DeviceCMYK", "DCTDecode", decode="1 0 1 0 1 0 1 0")
+
+  color_space = "DeviceGray" if im.mode == "L" else "DeviceRGB"
+  return EncodedImage(buffer.getvalue(), im.width, im.height, color_space, "DCTDecode")
+
+# 16-bit grayscale as 8-bit L. Pillow's own conversion clips every value above 255
+# instead of scaling, which turns most of the image white.
+def scale_to_8_bits(im):
+  if im.mode != "I":
+    im = im.convert("I")
+
+  low, high = im.getextrema()
+  if low < 0 or high > 0xFFFF:
+    raise ValueError("Grayscale images with more than 16 bits are not supported.")
+
+  return im.point(lambda value: value / 256).convert("L")
+
+# A 1-bit image as CCITT G4, the compression used for scanned documents. Pillow only has
+# the encoder when it's built with libtiff, otherwise the bits are deflated.
+def encode_bilevel(im) -> EncodedImage:
+  import zlib
+  from PIL import features
+
+  if not features.check("libtiff"):
+    return EncodedImage(zlib.compress(im.tobytes()), im.width, im.height, "DeviceGray", "FlateDecode", bits=1)
+
+  # A single-strip TIFF holds the G4 data right after its 8-byte header.
+  buffer = BytesIO()
+  im.save(buffer, "TIFF", compression="group4", strip_size=(im.width + 7) // 8 * im.height)
+  parms = f"/K -1 /BlackIs1 true /Columns {im.width} /Rows {im.height}"
+  return EncodedImage(buffer.getvalue()[8:], im.width, im.height, "DeviceGray", "CCITTFaxDecode",
+    bits=1, decode_parms=parms)
+
+# A palette image as deflated palette indices, one byte per pixel, with an RGB palette.
+def encode_palette(im) -> EncodedImage:
+  import zlib
+
+  if im.mode == "PA":
+    im = im.convert("P")
+  palette = bytes(im.getpalette("RGB"))
+  return EncodedImage(zlib.compress(im.tobytes()), im.width, im.height, "DeviceRGB", "FlateDecode",
+    palette=palette)
+
+class ImagePdfWriter:
+
+  def __init__(self, file: BinaryIO) -> None:
+    self.file = file
+    self.offsets = {} # object id -> byte offset
+    self.page_ids: List[int] = []
+    self.next_id = PAGES_ID + 1
+
+    self.file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+  # Add one page showing the image at 72 DPI (one point per pixel).
+  def add_page(self, image: EncodedImage) -> None:
+    image_id, content_id, page_id = self.next_id, self.next_id + 1, self.next_id + 2
+    self.next_id += 3
+
+    color_space = f"/{image.color_space}"
+    if image.palette:
+      color_space = f"[/Indexed {color_space} {len(image.palette) // 3 - 1} <{image.palette.hex()}>]"
+
+    entries = (
+      f"/Type /XObject /Subtype /Image /Width {image.width} /Height {image.height} "
+      f"/ColorSpace {color_space} /BitsPerComponent {image.bits} /Filter /{image.filter}"
+    )
+    if image.decode_parms:
+      entries += f" /DecodeParms << {image.decode_parms} >>"
+    if image.decode:
+      entries += f" /Decode [{image.decode}]"
+
+    self._write_stream(image_id, entries, image.data)
+
+    content = f"q {image.width} 0 0 {image.height} 0 0 cm /Im0 Do Q".encode()
+    self._write_stream(content_id, "", content)
+
+    self._write_object(page_id, (
+      f"<< /Type /Page /Parent {PAGES_ID} 0 R /MediaBox [0 0 {image.width} {image.height}] "
+      f"/Resources << /XObject << /Im0 {image_id} 0 R >> >> /Contents {content_id} 0 R >>"
+    ).encode())
+
+    self.page_ids.append(page_id)
+
+  # Write the page tree, catalog and cross-reference table.
+  def close(self) -> None:
+    kids = " ".join(f"{page_id} 0 R" for page_id in self.page_ids)
+
+    self._write_object(PAGES_ID, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode())
+    self._write_object(CATALOG_ID, f"<< /Type /Catalog /Pages {PAGES_ID} 0 R >>".encode())
+
+    xref_offset = self.file.tell()
+    size = self.next_id
+
+    self.file.write(f"xref\n0 {size}\n0000000000 65535 f \n".encode())
+    for object_id in range(1, size):
+      self.file.write(f"{self.offsets[object_id]:010d} 00000 n \n".encode())
+
+    self.file.write((
+      f"trailer\n<< /Size {size} /Root {CATALOG_ID} 0 R >>\n"
+      f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode())
+
+  def _write_object(self, object_id: int, body: bytes) -> None:
+    self.offsets[object_id] = self.file.tell()
+    self.file.write(f"{object_id} 0 obj\n".encode() + body + b"\nendobj\n")
+
+  def _write_stream(self, object_id: int, entries: str, data: bytes) -> None:
+    entries = f"{entries} /Length {len(data)}".strip()
+    header = f"<< {entries} >>\nstream\n".encode()
+    self._write_object(object_id, header + data + b"\nendstream")
@@ -0,0 +1,185 @@
+# Helpers for recompressing the images inside a PDF.
+# Images are detached from their document so they can be sent to worker processes,
+# recompressed there, and reattached to the writer in the main process.
+from io import BytesIO
+from math import hypot
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+  from pypdf import PdfWriter, PageObject
+  from pypdf.generic import IndirectObject, PdfObject
+
+# Yield the image XObjects drawn by a page, including those inside form XObjects.
+# Inline images and images stored as direct objects can't be replaced and are skipped.
+def image_references(page: "PageObject") -> Iterator["IndirectObject"]:
+  from pypdf.generic import IndirectObject
+
+  seen_forms = set()
+
+  def walk(resources) -> Iterator["IndirectObject"]:
+    if resources is None:
+      return
+
+    xobjects = resources.get_object().get("/XObject")
+    if xobjects is None:
+      return
+
+    for ref in xobjects.get_object().values():
+      if not isinstance(ref, IndirectObject):
+        continue
+
+      xobject = ref.get_object()
+      subtype = xobject.get("/Subtype")
+
+      if subtype == "/Image":
+        yield ref
+      elif subtype == "/Form" and ref.idnum not in seen_forms:
+        seen_forms.add(ref.idnum)
+        yield from walk(xobject.get("/Resources"))
+
+  yield from walk(page.get("/Resources"))
+
+# Every image reference drawn by the given pages, in page order. An image shown
+# on several pages is listed once per page.
+def collect_images(pages: List["PageObject"]) -> List["IndirectObject"]:
+  return [ref for page in pages for ref in image_references(page)]
+
+IDENTITY = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+MAX_FORM_DEPTH = 10
+
+# Multiply two PDF matrices [a b c d e f], applying m first, then n.
+def multiply(m: List[float], n: List[float]) -> List[float]:
+  return [
+    m[0] * n[0] + m[1] * n[2],
+    m[0] * n[1] + m[1] * n[3],
+    m[2] * n[0] + m[3] * n[2],
+    m[2] * n[1] + m[3] * n[3],
+    m[4] * n[0] + m[5] * n[2] + n[4],
+    m[4] * n[1] + m[5] * n[3] + n[5]
+  ]
+
+# Largest size (width, height in points) each image is drawn at, keyed by object number.
+# Follows q/Q/cm through the page content and any form XObjects it draws.
+def image_placements(pages: List["PageObject"]) -> Dict[int, Tuple[float, float]]:
+  from pypdf.generic import ContentStream, IndirectObject
+
+  sizes = {}
+
+  def walk(content, resources, ctm: List[float], depth: int) -> None:
+    xobjects = resources.get_object().get("/XObject") if resources is not None else None
+    xobjects = xobjects.get_object() if xobjects is not None else {}
+    stack = []
+
+    for operands, operator in content.operations:
+      if operator == b"q":
+        stack.append(ctm)
+      elif operator == b"Q" and stack:
+        ctm = stack.pop()
+      elif operator == b"cm":
+        ctm = multiply([float(value) for value in operands], ctm)
+      elif operator == b"Do":
+        ref = xobjects.get(operands[0])
+        if not isinstance(ref, IndirectObject):
+          continue
+
+        xobject = ref.get_object()
+        subtype = xobject.get("/Subtype")
+
+        if subtype == "/Image":
+          # the unit square is mapped by the CTM, so its column lengths are the drawn size
+          width, height = hypot(ctm[0], ctm[1]), hypot(ctm[2], ctm[3])
+          old_width, old_height = sizes.get(ref.idnum, (0.0, 0.0))
+          sizes[ref.idnum] = (max(width, old_width), max(height, old_height))
+        elif subtype == "/Form" and depth < MAX_FORM_DEPTH:
+          matrix = [float(value) for value in xobject.get("/Matrix", IDENTITY)]
+          form_content = ContentStream(xobject, ref.pdf)
+          walk(form_content, xobject.get("/Resources", resources), multiply(matrix, ctm), depth + 1)
+
+  for page in pages:
+    content = page.get_contents()
+    if content is not None:
+      walk(content, page.get("/Resources"), IDENTITY, 0)
+
+  return sizes
+
+# Pixel size to downsample an image to so it is no more than max_dpi where it is drawn,
+# or None if it is already at or below that resolution.
+def target_size(xobject: "PdfObject", placed: Tuple[float, float], max_dpi: int) -> Optional[Tuple[int, int]]:
+  width, height = int(xobject["/Width"]), int(xobject["/Height"])
+  placed_width, placed_height = placed
+
+  scale = max(placed_width / 72 * max_dpi / width, placed_height / 72 * max_dpi / height)
+  if scale >= 1:
+    return None
+
+  return (max(1, round(width * scale)), max(1, round(height * scale)))
+
+# Content hash of an image XObject: its raw stream data plus its dictionary (minus
+# /Length). Images with the same key recompress to the same bytes.
+def image_key(xobject: "PdfObject") -> str:
+  from hashlib import sha256
+
+  digest = sha256(xobject._data)
+  entries = sorted((key, repr(value)) for key, value in xobject.items() if key != "/Length")
+  digest.update(repr(entries).encode())
+
+  return digest.hexdigest()
+
+# Copy an object with every indirect reference resolved, so it no longer depends
+# on the document it came from and can be pickled.
+def detach_object(obj: "PdfObject") -> "PdfObject":
+  from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+  if isinstance(obj, IndirectObject):
+    obj = obj.get_object()
+
+  if isinstance(obj, StreamObject):
+    copy = type(obj)()
+    copy.update({key: detach_object(value) for key, value in obj.items()})
+    copy._data = obj._data # raw (still encoded) stream data
+    return copy
+
+  if isinstance(obj, DictionaryObject):
+    return DictionaryObject({key: detach_object(value) for key, value in obj.items()})
+
+  if isinstance(obj, ArrayObject):
+    return ArrayObject(detach_object(value) for value in obj)
+
+  return obj
+
+# Decode a detached image XObject and re-encode it the same way pypdf's ImageFile.replace
+# does: as a one-page PDF written by Pillow, optionally downsampled to size first.
+# Takes a single (xobject, size) task so it can be mapped over by worker processes.
+def recompress_image(task: Tuple["PdfObject", Optional[Tuple[int, int]]], quality: int) -> bytes:
+  from PIL import Image
+
+  xobject, size = task
+  image = xobject.decode_as_image()
+  if image is None:
+    raise ValueError("Unsupported image encoding.")
+
+  if size is not None:
+    image = image.resize(size, Image.Resampling.LANCZOS)
+
+  buffer = BytesIO()
+  image.save(buffer, "PDF", quality=quality)
+  return buffer.getvalue()
+
+# The image XObject inside a PDF made by recompress_image.
+def read_recompressed(pdf_bytes: bytes) -> "PdfObject":
+  from pypdf import PdfReader
+
+  xobjects = PdfReader(BytesIO(pdf_bytes)).pages[0]["/Resources"]["/XObject"]
+  return next(iter(xobjects.values())).get_object()
+
+# Swap the image behind reference for the one in a PDF made by recompress_image,
+# but only if the new image stream is smaller. Returns whether it was replaced.
+def attach_image(writer: "PdfWriter", reference: "IndirectObject", pdf_bytes: bytes) -> bool:
+  image = read_recompressed(pdf_bytes)
+
+  if len(image._data) >= len(reference.get_object()._data):
+    return False
+
+  writer._objects[reference.idnum - 1] = image
+  image.indirect_reference = reference
+  return True
@@ -0,0 +1,177 @@
+# Save changes to a PDF as an incremental update: the original bytes are kept as they are and
+# only the changed objects, a cross-reference section for them and a new trailer are appended.
+# Time spent writing is proportional to the change, not the document. Also meant for
+# metadata edits: replace the /Info dictionary with set_object and save.
+import os
+import re
+import zlib
+from typing import TYPE_CHECKING, BinaryIO, Dict, List, Tuple
+
+from pdfcli.utils.page_utils import PdfSession
+from pdfcli.utils.validators import exit_with_error_message
+
+if TYPE_CHECKING:
+  from pypdf import PdfReader
+  from pypdf.generic import IndirectObject, PdfObject
+
+class IncrementalUpdate:
+
+  # With mmap, the file is memory-mapped, so only the trailer, xref and touched objects are loaded.
+  def __init__(self, path: str, *, mmap: bool = False) -> None:
+    session = PdfSession(path, mmap=mmap)
+    self.path = session.path
+    self.reader: "PdfReader" = session.parsed
+
+    self.changes: Dict[Tuple[int, int], "PdfObject"] = {}
+    self.size = int(self.reader.trailer["/Size"])
+
+    if self.reader.is_encrypted:
+      self.close()
+      exit_with_error_message("Encrypted PDFs can't be updated incrementally. Decrypt it first.")
+
+    self.startxref = self._find_startxref()
+    self.xref_stream = self._last_xref_is_stream()
+
+  def __enter__(self) -> "IncrementalUpdate":
+    return self
+
+  def __exit__(self, *exc) -> None:
+    self.close()
+
+  def close(self) -> None:
+    self.reader.stream.close()
+
+  # Replace an existing object.
+  def set_object(self, reference: "IndirectObject", obj: "PdfObject") -> None:
+    self.changes[(reference.idnum, reference.generation)] = obj
+
+  # Add a new object and return a reference to it.
+  def add_object(self, obj: "PdfObject") -> "IndirectObject":
+    from pypdf.generic import IndirectObject
+
+    reference = IndirectObject(self.size, 0, self.reader)
+    self.size += 1
+    self.changes[(reference.idnum, 0)] = obj
+    return reference
+
+  # Write the original file followed by the update to output. If output is the input file,
+  # the update is appended in place and nothing else is written.
+  def save(self, output: str) -> None:
+    import shutil
+
+    if not os.path.exists(output) or not os.path.samefile(self.path, output):
+      shutil.copyfile(self.path, output)
+
+    with open(output, "r+b") as f:
+      f.seek(-1, os.SEEK_END)
+      if f.read(1) not in (b"\n", b"\r"):
+        f.write(b"\n")
+      self._write_update(f)
+
+  def _write_update(self, stream: BinaryIO) -> None:
+    from pypdf.generic import ArrayObject, ByteStringObject, DictionaryObject, NameObject, NumberObject
+
+    offsets = {}
+    for (idnum, generation), obj in sorted(self.changes.items()):
+      offsets[(idnum, generation)] = stream.tell()
+      stream.write(f"{idnum} {generation} obj\n".encode())
+      obj.write_to_stream(stream)
+      stream.write(b"\nendobj\n")
+
+    trailer = DictionaryObject()
+    for key in ("/Root", "/Info"):
+      if key in self.reader.trailer:
+        trailer[NameObject(key)] = self.reader.trailer.raw_get(key)
+    if "/ID" in self.reader.trailer:
+      # the first identifier names the document, the second changes with each revision
+      original = self.reader.trailer["/ID"]
+      trailer[NameObject("/ID")] = ArrayObject([original[0], ByteStringObject(os.urandom(16))])
+    trailer[NameObject("/Prev")] = NumberObject(self.startxref)
+
+    # an update's cross-reference section has the same form as the one before it
+    if self.xref_stream:
+      self._write_xref_stream(stream, offsets, trailer)
+    else:
+      self._write_xref_table(stream, offsets, trailer)
+
+  def _write_xref_table(self, stream: BinaryIO, offsets: Dict[Tuple[int, int], int], trailer) -> None:
+    from pypdf.generic import NameObject, NumberObject
+
+    xref_location = stream.tell()
+    # readers expect a table to start at object 0, so list the head of the free list too
+    stream.write(b"xref\n0 1\n0000000000 65535 f \n")
+    for section in subsections(sorted(offsets)):
+      stream.write(f"{section[0][0]} {len(section)}\n".encode())
+      for key in section:
+        stream.write(f"{offsets[key]:0>10} {key[1]:0>5} n \n".encode())
+
+    trailer[NameObject("/Size")] = NumberObject(self.size)
+    stream.write(b"trailer\n")
+    trailer.write_to_stream(stream)
+    stream.write(f"\nstartxref\n{xref_location}\n%%EOF\n".encode())
+
+  def _write_xref_stream(self, stream: BinaryIO, offsets: Dict[Tuple[int, int], int], trailer) -> None:
+    from pypdf.generic import ArrayObject, NameObject, NumberObject, StreamObject
+
+    xref_id = self.size
+    xref_location = stream.tell()
+    offsets = {**offsets, (xref_id, 0): xref_location}
+    keys = sorted(offsets)
+
+    width = max(1, (max(offsets.values()).bit_length() + 7) // 8)
+    rows = b"".join(
+      b"\x01" + offsets[key].to_bytes(width, "big") + key[1].to_bytes(2, "big")
+      for key in keys
+    )
+
+    xref = StreamObject()
+    xref.update(trailer)
+    xref[NameObject("/Type")] = NameObject("/XRef")
+    xref[NameObject("/Size")] = NumberObject(xref_id + 1)
+    xref[NameObject("/W")] = ArrayObject(NumberObject(value) for value in (1, width, 2))
+    xref[NameObject("/Index")] = ArrayObject(
+      NumberObject(value) for section in subsections(keys) for value in (section[0][0], len(section))
+    )
+    xref[NameObject("/Filter")] = NameObject("/FlateDecode")
+    xref._data = zlib.compress(rows)
+
+    stream.write(f"{xref_id} 0 obj\n".encode())
+    xref.write_to_stream(stream)
+    stream.write(f"\nendobj\nstartxref\n{xref_location}\n%%EOF\n".encode())
+
+  # Offset of the file's last cross-reference section, from the last startxref near its end.
+  def _find_startxref(self) -> int:
+    stream = self.reader.stream
+    stream.seek(0, os.SEEK_END)
+    stream.seek(max(0, stream.tell() - 1024))
+    found = re.findall(rb"startxref\s+(\d+)", stream.read())
+
+    if not found:
+      self.close()
+      exit_with_error_message("The PDF has no startxref, so it can't be updated incrementally.")
+    return int(found[-1])
+
+  # Whether the file's last cross-reference section is a stream (PDF 1.5+) rather than a table.
+  # Files whose startxref is wrong can't be updated, since the update has to point back at it.
+  def _last_xref_is_stream(self) -> bool:
+    stream = self.reader.stream
+    stream.seek(self.startxref)
+    start = stream.read(32).lstrip()
+
+    if start.startswith(b"xref"):
+      return False
+    if re.match(rb"\d+\s+\d+\s+obj", start):
+      return True
+
+    self.close()
+    exit_with_error_message("The PDF's cross-reference data is damaged, so it can't be updated incrementally.")
+
+# Split sorted (idnum, generation) keys into runs of consecutive object numbers.
+def subsections(keys: List[Tuple[int, int]]) -> List[List[Tuple[int, int]]]:
+  sections = []
+  for key in keys:
+    if sections and key[0] == sections[-1][-1][0] + 1:
+      sections[-1].append(key)
+    else:
+      sections.append([key])
+  return sections
@@ -0,0 +1,123 @@
+# Write a PdfWriter's document packing its objects into compressed object streams,
+# with a cross-reference stream instead of a classic xref table (PDF 1.5+).
+# pypdf only writes the classic layout, so this replaces PdfWriter.write_stream.
+# It works on PdfWriter's internals (_objects, _encryption, _info, _ID), which is why
+# pyproject pins pypdf below 7.
+import zlib
+from io import BytesIO
+from typing import TYPE_CHECKING, BinaryIO, Dict, List, Tuple
+
+if TYPE_CHECKING:
+  from pypdf import PdfWriter
+
+OBJECTS_PER_STREAM = 100
+
+def write_object_streams(writer: "PdfWriter", stream: BinaryIO, *, level: int = 6) -> None:
+  from pypdf.generic import ArrayObject, DictionaryObject, NameObject, NumberObject, StreamObject
+
+  writer._resolve_links() # same preparation PdfWriter.write_stream does
+
+  objects = writer._objects
+  encryption = writer._encryption
+  encrypt_entry = writer._encrypt_entry
+
+  # xref entries by object number: (type, field 2, field 3)
+  entries: Dict[int, Tuple[int, int, int]] = {0: (0, 0, 65535)}
+  packed: List[Tuple[int, bytes]] = [] # objects waiting for the current object stream
+  next_id = len(objects) + 1
+
+  header = writer.pdf_header
+  if header < "%PDF-1.5":
+    header = "%PDF-1.5"
+  stream.write(header.encode() + b"\n%\xe2\xe3\xcf\xd3\n")
+
+  def write_object(idnum: int, obj) -> None:
+    entries[idnum] = (1, stream.tell(), 0)
+    stream.write(f"{idnum} 0 obj\n".encode())
+    obj.write_to_stream(stream)
+    stream.write(b"\nendobj\n")
+
+  def flush_packed() -> None:
+    nonlocal next_id
+
+    if not packed:
+      return
+
+    objstm_id = next_id
+    next_id += 1
+
+    offsets, body = [], BytesIO()
+    for index, (idnum, data) in enumerate(packed):
+      offsets.append(f"{idnum} {body.tell()}")
+      body.write(data + b"\n")
+      entries[idnum] = (2, objstm_id, index)
+
+    first = (" ".join(offsets) + "\n").encode()
+    objstm = StreamObject()
+    objstm[NameObject("/Type")] = NameObject("/ObjStm")
+    objstm[NameObject("/N")] = NumberObject(len(packed))
+    objstm[NameObject("/First")] = NumberObject(len(first))
+    objstm[NameObject("/Filter")] = NameObject("/FlateDecode")
+    objstm._data = zlib.compress(first + body.getvalue(), level)
+
+    if encryption:
+      objstm = encryption.encrypt_object(objstm, objstm_id, 0)
+
+    write_object(objstm_id, objstm)
+    packed.clear()
+
+  for idnum, obj in enumerate(objects, start=1):
+    if obj is None:
+      entries[idnum] = (0, 0, 1)
+      continue
+
+    # streams and the encryption dictionary can't live inside an object stream
+    if isinstance(obj, StreamObject) or obj is encrypt_entry:
+      if encryption and obj is not encrypt_entry:
+        obj = encryption.encrypt_object(obj, idnum, 0)
+      write_object(idnum, obj)
+      continue
+
+    # strings inside an object stream are protected by encrypting the whole stream
+    data = BytesIO()
+    obj.write_to_stream(data)
+    packed.append((idnum, data.getvalue()))
+
+    if len(packed) >= OBJECTS_PER_STREAM:
+      flush_packed()
+
+  flush_packed()
+
+  # cross-reference stream, which also carries the trailer entries
+  xref_id = next_id
+  xref_location = stream.tell()
+  entries[xref_id] = (1, xref_location, 0)
+  size = xref_id + 1
+
+  widths = [1, max(1, (max(field for _, field, _ in entries.values()).bit_length() + 7) // 8), 2]
+  rows = b"".join(
+    kind.to_bytes(widths[0], "big") + field.to_bytes(widths[1], "big") + extra.to_bytes(widths[2], "big")
+    for kind, field, extra in (entries[idnum] for idnum in range(size))
+  )
+
+  trailer = DictionaryObject({
+    NameObject("/Type"): NameObject("/XRef"),
+    NameObject("/Size"): NumberObject(size),
+    NameObject("/W"): ArrayObject(NumberObject(width) for width in widths),
+    NameObject("/Root"): writer.root_object.indirect_reference,
+    NameObject("/Filter"): NameObject("/FlateDecode")
+  })
+  if writer._info is not None:
+    trailer[NameObject("/Info")] = writer._info.indirect_reference
+  if writer._ID is not None:
+    trailer[NameObject("/ID")] = writer._ID
+  if encrypt_entry:
+    trailer[NameObject("/Encrypt")] = encrypt_entry.indirect_reference
+
+  xref = StreamObject()
+  xref.update(trailer)
+  xref._data = zlib.compress(rows, level)
+
+  stream.write(f"{xref_id} 0 obj\n".encode())
+  xref.write_to_stream(stream)
+  stream.write(f"\nendobj\nstartxref\n{xref_location}\n%%EOF\n".encode())
@@ -0,0 +1,151 @@
+# Random access to a document's pages without flattening the whole page tree.
+# pypdf's reader.pages visits every node and builds a PageObject for every page before
+# returning the first one. PageTree descends from the root instead, skipping whole subtrees
+# by their /Count, so finding a page reads only the nodes on its path and their kids:
+# logarithmic in the page count for a balanced tree.
+#
+# pypdf lists pages without looking at /Count, so every node on the path is checked: its
+# /Count has to be the sum of its kids' counts. A single wrong /Count makes its parent fail
+# that check, and the parent is on the path of every page the wrong count would misplace,
+# so those lookups fall back to pypdf's list instead of returning the wrong page.
+from bisect import bisect_right
+from collections.abc import Sequence
+from itertools import accumulate
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+if TYPE_CHECKING:
+  from pypdf import PageObject, PdfReader
+  from pypdf.generic import DictionaryObject
+
+# Page attributes a page can inherit from its ancestors in the page tree.
+INHERITABLE = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+# pages before each kid of a node (with the total at the end), and the kids themselves
+NodeIndex = Tuple[List[int], List["DictionaryObject"]]
+
+class BrokenPageTree(Exception):
+  pass
+
+class PageTree(Sequence):
+
+  def __init__(self, reader: "PdfReader") -> None:
+    from pypdf.generic import DictionaryObject
+
+    self.reader = reader
+    self.root = reader.root_object["/Pages"].get_object()
+    if not isinstance(self.root, DictionaryObject):
+      raise BrokenPageTree("The document has no page tree.")
+
+    self.nodes: Dict[int, NodeIndex] = {} # id() of each node read so far -> its index
+    self.pages: Dict[int, "PageObject"] = {} # pages found so far, so a page is the same object each time
+    self.broken = False # set once a node on some path didn't add up, see __getitem__
+    self.total = self._index(self.root)[0][-1]
+
+  def __len__(self) -> int:
+    return len(self.reader.pages) if self.broken else self.total
+
+  def __getitem__(self, index):
+    if isinstance(index, slice):
+      return [self[i] for i in range(*index.indices(len(self)))]
+
+    if not self.broken:
+      try:
+        return self._get(index)
+      except BrokenPageTree:
+        self.broken = True
+    return self.reader.pages[index]
+
+  def _get(self, index: int) -> "PageObject":
+    if index < 0:
+      index += self.total
+    if not 0 <= index < self.total:
+      raise IndexError("page index out of range")
+
+    if index not in self.pages:
+      self.pages[index] = self._find(index)
+    return self.pages[index]
+
+  def _find(self, index: int) -> "PageObject":
+    from pypdf import PageObject
+    from pypdf.generic import NameObject
+
+    node = self.root
+    inherited = {}
+    path = set()
+
+    while True:
+      if id(node) in path: # a node listed among its own descendants
+        raise BrokenPageTree("The page tree has a loop.")
+      path.add(id(node))
+
+      for key in INHERITABLE:
+        if key in node:
+          inherited[key] = node.raw_get(key)
+
+      offsets, kids = self._index(node)
+      position = bisect_right(offsets, index) - 1
+      kid = kids[position]
+      index -= offsets[position]
+
+      if node_type(kid) == "/Page":
+        page = PageObject(self.reader, kid.indirect_reference)
+        page.update(kid)
+        for key, value in inherited.items():
+          if key not in page:
+            page[NameObject(key)] = value
+        return page
+
+      node = kid
+
+  # Pages before each kid of node, read once per node and checked against the node's /Count.
+  # Pages count 1 and other nodes their /Count.
+  def _index(self, node: "DictionaryObject") -> NodeIndex:
+    if id(node) not in self.nodes:
+      kids = self._kids(node)
+      counts = [1 if node_type(kid) == "/Page" else page_count(kid) for kid in kids]
+      offsets = [0, *accumulate(counts)]
+
+      if page_count(node) != offsets[-1]:
+        raise BrokenPageTree("A page tree node's page count doesn't match its pages.")
+      self.nodes[id(node)] = (offsets, kids)
+
+    return self.nodes[id(node)]
+
+  # The kids of node that pypdf lists pages from.
+  def _kids(self, node: "DictionaryObject") -> List["DictionaryObject"]:
+    from pypdf.generic import DictionaryObject
+
+    kids = []
+    for reference in node.get("/Kids", []):
+      kid = reference.get_object()
+      if not kid: # skipped by pypdf too
+        continue
+      if not isinstance(kid, DictionaryObject):
+        raise BrokenPageTree("The page tree has an invalid node.")
+      kids.append(kid)
+    return kids
+
+# The same test pypdf uses: a node without /Type is a page unless it has /Kids.
+def node_type(node: "DictionaryObject") -> str:
+  if "/Type" in node:
+    return node["/Type"]
+  return "/Pages" if "/Kids" in node else "/Page"
+
+# A /Pages node's /Count, which has to be a number that isn't negative.
+def page_count(node: "DictionaryObject") -> int:
+  count = node.get("/Count")
+  if count is not None:
+    count = count.get_object()
+  if not isinstance(count, int) or count < 0:
+    raise BrokenPageTree("A page tree node has no page count.")
+  return int(count)
+
+# The pages of reader to pick pages from: a PageTree unless pypdf has already listed them
+# or the root's /Count doesn't match its kids, in which case pypdf's own list is used.
+def page_source(reader: "PdfReader") -> Sequence["PageObject"]:
+  if reader.flattened_pages is None:
+    try:
+      return PageTree(reader)
+    except BrokenPageTree:
+      pass
+  return reader.pages
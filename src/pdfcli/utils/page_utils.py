@@ -1,66 +1,238 @@
-from contextlib import contextmanager
-from functools import wraps
+from bisect import bisect_right
+from collections.abc import Sequence
+from itertools import accumulate
 from pathlib import Path
-from typing import List
-from pypdf import PdfReader
-import rich
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Tuple
 import typer
 
-from pdfcli.utils.validators import ensure_extension, exit_with_error_message, output_validator, path_validator
+from pdfcli.utils.cli_utils import rprint
+from pdfcli.utils.validators import ensure_extension, exit_with_error_message, output_validator, page_validator, path_validator
 
-# Returned a list without duplicates while in the same order based on the input.
-def dedupe_ordered(numbers :List[int]) -> List[int]:
-  seen = set()
-  order_list = []
+if TYPE_CHECKING:
+  import mmap
+  from pypdf import PdfReader, PdfWriter
 
-  for number in numbers:
-    if number not in seen:
-      seen.add(number)
-      order_list.append(number)
+# A page selection kept as ranges instead of every page number, e.g. '1-5,9,12-10' is
+# [range(1, 6), range(9, 10), range(12, 9, -1)]. Size, bounds, deduplication and the
+# complement are worked out from the ranges. Page numbers are only produced when iterated.
+class PageRanges(Sequence):
 
-  return order_list
+  def __init__(self, ranges: Iterable[range] = ()) -> None:
+    self.ranges = [pages for pages in ranges if len(pages)]
+    self.offsets = list(accumulate(len(pages) for pages in self.ranges)) # pages up to and including each range
 
-# Add the remaining missing pages not in the page list.
-def add_remaining_pages(page_numbers: List[int], total_pages: int) -> List[int]:
-  seen = set(page_numbers)
+  # Compress a list of page numbers into runs of consecutive pages.
+  @classmethod
+  def from_pages(cls, numbers: Iterable[int]) -> "PageRanges":
+    if isinstance(numbers, PageRanges):
+      return numbers
 
-  for page_number in range(total_pages):
-    if page_number not in seen:
-      page_numbers.append(page_number)
-  
-  return page_numbers
+    runs = [] # [first, last, step], step is None until a run has two pages
+    for number in numbers:
+      if runs:
+        first, last, step = runs[-1]
+        if (step is None and abs(number - last) == 1) or (step is not None and number == last + step):
+          runs[-1] = [first, number, number - last]
+          continue
+      runs.append([number, number, None])
 
-# Parse a page range string like '1-5,7,8,10-12,9' into a list of integers: [1,2,3,4,5,7,8,10,11,12,9]
-def parse_page_ranges(pages: str, *, dups: bool = False, subtract_one: bool = False) -> List[int]:
-  page_lst = []
-  parts = [page.strip() for page in pages.strip(',').split(',')]
+    return cls(range(first, last + (step or 1), step or 1) for first, last, step in runs)
 
-  # TODO: Create a validation function to check if the input is valid or need cleaning
+  def __len__(self) -> int:
+    return self.offsets[-1] if self.offsets else 0
 
-  for part in parts:
-    if "-" in part:
-      start, end = part.split("-")
-      start, end = int(start), int(end)
+  def __iter__(self) -> Iterator[int]:
+    for pages in self.ranges:
+      yield from pages
+
+  def __getitem__(self, index: int) -> int:
+    if index < 0:
+      index += len(self)
+    if not 0 <= index < len(self):
+      raise IndexError("page index out of range")
+
+    position = bisect_right(self.offsets, index)
+    before = self.offsets[position - 1] if position else 0
+    return self.ranges[position][index - before]
+
+  def __eq__(self, other: object) -> bool:
+    if not isinstance(other, Sequence):
+      return NotImplemented
+    return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+  __hash__ = None
+
+  def __repr__(self) -> str:
+    return f"PageRanges({self.ranges!r})"
+
+  # (lowest, highest) page, read from the ends of each range.
+  def bounds(self) -> Tuple[int, int]:
+    return min(min(pages[0], pages[-1]) for pages in self.ranges), max(max(pages[0], pages[-1]) for pages in self.ranges)
+
+  # The same pages without repeats, keeping the first time each page appears.
+  def dedupe(self) -> "PageRanges":
+    covered = [] # sorted, non-overlapping (start, stop) spans already used
+    result = []
+
+    for pages in self.ranges:
+      low, high = min(pages[0], pages[-1]), max(pages[0], pages[-1]) + 1
+      first = bisect_right(covered, low, key=lambda span: span[1]) # first span ending after low
+
+      # parts of [low, high) no earlier range has used
+      pieces = []
+      position, last = low, first
+      while last < len(covered) and covered[last][0] < high:
+        start, stop = covered[last]
+        if start > position:
+          pieces.append((position, start))
+        position = max(position, stop)
+        last += 1
+      if position < high:
+        pieces.append((position, high))
 
-      if subtract_one:
-        start -= 1
-        end -= 1
+      if last > first:
+        low, high = min(low, covered[first][0]), max(high, covered[last - 1][1])
+      covered[first:last] = [(low, high)]
 
-      # If reorder is reversed
-      if start > end: 
-        page_lst.extend(range(start, end - 1, -1))
+      if pages.step > 0:
+        result.extend(range(start, stop) for start, stop in pieces)
       else:
-        page_lst.extend(range(start, end + 1))
+        result.extend(range(stop - 1, start - 1, -1) for start, stop in reversed(pieces))
+
+    return PageRanges(result)
+
+  # Pages from 0 to total_pages - 1 that aren't in the selection, in ascending order.
+  def complement(self, total_pages: int) -> "PageRanges":
+    spans = sorted((min(pages[0], pages[-1]), max(pages[0], pages[-1]) + 1) for pages in self.ranges)
+
+    result = []
+    position = 0
+    for start, stop in spans:
+      if start > position:
+        result.append(range(position, min(start, total_pages)))
+      position = max(position, stop)
+    result.append(range(position, total_pages))
+
+    return PageRanges(result)
+
+  # The selection in ascending order without repeats.
+  def ascending(self) -> "PageRanges":
+    spans = sorted((min(pages[0], pages[-1]), max(pages[0], pages[-1]) + 1) for pages in self.ranges)
+
+    merged = []
+    for start, stop in spans:
+      if merged and start <= merged[-1][1]:
+        merged[-1][1] = max(merged[-1][1], stop)
+      else:
+        merged.append([start, stop])
+
+    return PageRanges(range(start, stop) for start, stop in merged)
+
+# Returned the pages without duplicates while in the same order based on the input.
+def dedupe_ordered(numbers: Iterable[int]) -> PageRanges:
+  return PageRanges.from_pages(numbers).dedupe()
+
+# Add the remaining missing pages not in the page list.
+def add_remaining_pages(page_numbers: Iterable[int], total_pages: int) -> PageRanges:
+  pages = PageRanges.from_pages(page_numbers)
+  return PageRanges(pages.ranges + pages.complement(total_pages).ranges)
+
+# Parse a page range string like '1-5,7,8,10-12,9' into PageRanges: 1,2,3,4,5,7,8,10,11,12,9
+# Raises ValueError with a readable message for malformed input.
+def parse_page_ranges(pages: str, *, dups: bool = False, subtract_one: bool = False) -> PageRanges:
+  ranges = []
+  parts = [page.strip() for page in pages.strip().strip(',').split(',')]
+
+  for part in parts:
+    bounds = [bound.strip() for bound in part.split("-")]
+    if len(bounds) > 2 or not all(bound.isdigit() for bound in bounds):
+      raise ValueError(f"Invalid page range '{part}'. Use page numbers and ranges like '1-5,7,9-8'.")
+
+    start, end = int(bounds[0]), int(bounds[-1])
+
+    if subtract_one:
+      start -= 1
+      end -= 1
+
+    # If reorder is reversed
+    if start > end: 
+      ranges.append(range(start, end - 1, -1))
     else:
-      num = int(part)
-      if subtract_one:
-        num -= 1
-      page_lst.append(num)
+      ranges.append(range(start, end + 1))
   
+  page_ranges = PageRanges(ranges)
   if not dups:
-    page_lst = dedupe_ordered(page_lst)
+    page_ranges = page_ranges.dedupe()
+
+  return page_ranges
+
+# Parse a 1-indexed page range string from the user into 0-indexed pages of a document with
+# total_pages pages, exiting with an error message if it is malformed or out of range.
+def select_pages(pages: str, total_pages: int, *, dups: bool = False) -> PageRanges:
+  try:
+    selection = parse_page_ranges(pages, dups=dups, subtract_one=True)
+  except ValueError as e:
+    exit_with_error_message(str(e))
+
+  if not page_validator(selection, total_pages):
+    exit_with_error_message("Page is out of range.")
+
+  return selection
+
+# Group page numbers into (first, last) runs of consecutive pages, each at most size pages long.
+# e.g. [1,2,3,4,5,9] with size 2 -> [(1,2),(3,4),(5,5),(9,9)]
+def page_chunks(pages: Iterable[int], size: int) -> List[Tuple[int, int]]:
+  chunks = []
+
+  for page in pages:
+    if chunks:
+      first, last = chunks[-1]
+      if page == last + 1 and page - first < size:
+        chunks[-1] = (first, page)
+        continue
+    chunks.append((page, page))
+
+  return chunks
+
+# Runs of consecutive pages, each split evenly by its share of the workers.
+# e.g. [1,2,3,6] with 2 workers -> [(1,3),(6,6)], and 1-8 with 3 workers -> [(1,3),(4,6),(7,8)]
+def worker_ranges(pages: Sequence[int], jobs: int) -> List[Tuple[int, int]]:
+  ranges = []
+
+  for first, last in page_chunks(pages, len(pages)):
+    length = last - first + 1
+    parts = min(length, max(1, jobs * length // len(pages)))
+    size, extra = divmod(length, parts) # the first extra parts get one page more
+
+    start = first
+    for part in range(parts):
+      end = start + size - (part >= extra)
+      ranges.append((start, end))
+      start = end + 1
+
+  return ranges
+
+# Read a manifest file listing one input path per line. Blank lines and lines
+# starting with '#' are ignored.
+def read_manifest(path: str) -> List[str]:
+  try:
+    with open(path, encoding="utf-8") as f:
+      lines = [line.strip() for line in f]
+  except OSError as e:
+    exit_with_error_message(f"Can't read manifest {path}: {e.strerror}")
+
+  return [line for line in lines if line and not line.startswith("#")]
+
+# Inputs given as arguments followed by the ones listed in the manifest, if any.
+def gather_inputs(inputs: List[str] | None, manifest: str | None) -> List[str]:
+  inputs = list(inputs or [])
+  if manifest:
+    inputs.extend(read_manifest(manifest))
 
-  return page_lst
+  if not inputs:
+    exit_with_error_message("No input files given.")
+
+  return inputs
 
 # Create path by validating first
 def create_path(path_name: str,*, default: str = "") -> str:
@@ -85,65 +257,148 @@ def create_path(path_name: str,*, default: str = "") -> str:
   
   return path_name # In case .strip() helps
 
-# Checks if PDF is real, and get password if it's password protected
-def read_pdf(filename:str, *, password: str | None = None) -> PdfReader:
-  path = ensure_extension(filename)
-  base = Path(filename).name
+# An opened (and, if needed, decrypted) PDF. The file is parsed once on first access
+# to .reader and the reader is reused by everything that needs it afterwards.
+class PdfSession:
 
-  if not Path(path).exists():
-    exit_with_error_message(f"File not found: {path}")
+  parse_count = 0 # total PdfReader parses in this process, exposed for tests
 
-  try:
-    reader = PdfReader(path)
-  except Exception as e:
-    exit_with_error_message(str(e))
-  
-  tries = 3
-  indicator = -1 # default value for no password
-
-  while reader.is_encrypted and tries > 0:
-
-    if not password:
-      password = typer.prompt(f"{base} is encrypted. Enter password", hide_input=True)
-    
-    indicator = reader.decrypt(password)
-    
-    if indicator == 0: # wrong password
-      tries -= 1
-      rich.print(f"[red]Wrong password. {tries} tries left.[/red]")
-    else:
-      break
-  
-  if indicator == 0: # if file is still encrypted
-    exit_with_error_message("Failed to decrpyt PDF.")
-    
-  return reader
+  def __init__(self, filename: str, *, password: str | None = None, mmap: bool = False) -> None:
+    self.path = ensure_extension(filename)
+    self.name = Path(filename).name
+    self.password = password # the password that unlocked the file, if any
+    self.mmap = mmap
+    self._reader = None
+    self._parsed = None # parsed but not yet decrypted
 
-def get_pdf_password(filename: str) -> str | None:
-  
-  base = Path(filename).name
-  try:
-    reader = PdfReader(filename)
-  except Exception as e:
-    exit_with_error_message(str(e))
-  
-  if not reader.is_encrypted:
-    return None
-
-  tries = 3
-  while reader.is_encrypted and tries > 0:
-    password = typer.prompt(f"{base} is encrypted. Enter password")
-    indicator = reader.decrypt(password)
-    if indicator == 0: # wrong password
-      tries -= 1
-      rich.print(f"[red]Wrong password. {tries} tries left.[/red]")
+    if not Path(self.path).exists():
+      exit_with_error_message(f"File not found: {self.path}")
+
+  @property
+  def reader(self) -> "PdfReader":
+    if self._reader is None:
+      self._reader = self._decrypt(self.parsed)
+      self._parsed = None
+    return self._reader
+
+  # The file as parsed, before it is decrypted. Parsing never prompts, so a command can
+  # look at the document (e.g. whether it's encrypted) before a password is asked for.
+  @property
+  def parsed(self) -> "PdfReader":
+    if self._reader is not None:
+      return self._reader
+    if self._parsed is None:
+      self._parsed = self._parse()
+    return self._parsed
+
+  @property
+  def page_count(self) -> int:
+    return len(self.reader.pages)
+
+  # Parse the file ahead of time without ever prompting, so it can run in a worker thread.
+  # Unencrypted files are loaded as far as their pages reach: objects nothing on a page
+  # refers to (e.g. ones an incremental update replaced) are never read. Encrypted ones are
+  # unlocked on first access to .reader.
+  def preload(self) -> "PdfSession":
+    from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject
+
+    reader = self._parse()
+
+    if reader.is_encrypted:
+      self._parsed = reader
+      return self
+
+    try:
+      pending = list(reader.pages)
+      seen = set()
+      while pending:
+        obj = pending.pop()
+        if isinstance(obj, IndirectObject):
+          if (obj.idnum, obj.generation) in seen:
+            continue
+          seen.add((obj.idnum, obj.generation))
+          obj = obj.get_object()
+
+        if isinstance(obj, DictionaryObject):
+          # the page tree above a page is already loaded by reader.pages
+          pending.extend(value for key, value in obj.items() if key != "/Parent")
+        elif isinstance(obj, ArrayObject):
+          pending.extend(obj)
+    except Exception as e:
+      exit_with_error_message(f"Failed to read {self.name}: {e}")
+
+    self._reader = reader
+    return self
+
+  def _parse(self) -> "PdfReader":
+    from pypdf import PdfReader
+
+    try:
+      reader = PdfReader(self._map() if self.mmap else self.path)
+    except Exception as e:
+      exit_with_error_message(str(e))
+
+    PdfSession.parse_count += 1
+    return reader
+
+  # A read-only memory map of the file, instead of a copy of it in memory. pypdf resolves
+  # objects from the xref when they are first used, so only the parts of the file holding
+  # those objects are ever loaded. The map stays open as long as the reader uses it.
+  def _map(self) -> "mmap.mmap":
+    import mmap
+
+    with open(self.path, "rb") as f:
+      mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # Objects are read in xref order, not file order. Without this the OS reads ahead
+    # around every object pypdf looks at, which loads most of a file with large streams.
+    if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_RANDOM"):
+      mapped.madvise(mmap.MADV_RANDOM)
+    return mapped
+
+  def _decrypt(self, reader: "PdfReader") -> "PdfReader":
+    tries = 3
+    indicator = -1 # default value for no password
+    password = self.password
+
+    while reader.is_encrypted and tries > 0:
+
+      if not password:
+        password = typer.prompt(f"{self.name} is encrypted. Enter password", hide_input=True)
+
+      indicator = reader.decrypt(password)
+
+      if indicator == 0: # wrong password
+        tries -= 1
+        password = None # ask again instead of retrying the same one
+        rprint(f"Wrong password. {tries} tries left.", status=1)
+      else:
+        self.password = password
+        break
+
+    if indicator == 0: # if file is still encrypted
+      exit_with_error_message("Failed to decrpyt PDF.")
+
+    return reader
+
+# Checks if PDF is real, and get password if it's password protected
+def open_pdf(filename: str, *, password: str | None = None, mmap: bool = False) -> PdfSession:
+  session = PdfSession(filename, password=password, mmap=mmap)
+  session.reader # parse and decrypt now so errors surface before any work starts
+  return session
+
+def read_pdf(filename: str, *, password: str | None = None, mmap: bool = False) -> "PdfReader":
+  return open_pdf(filename, password=password, mmap=mmap).reader
+
+# Write the document to output. With object_streams, objects are packed into compressed
+# object streams with a cross-reference stream, which is smaller for object-heavy files.
+def write_pdf(writer: "PdfWriter", output: str, *, object_streams: bool = False) -> None:
+  with open(output, "wb") as f:
+    if object_streams:
+      from pdfcli.utils.object_streams import write_object_streams
+      write_object_streams(writer, f)
     else:
-      break
-  
-  if indicator == 0: # if file is still encrypted
-    exit_with_error_message("Maximum password attempts exceeded.")
-  
-  return password
+      writer.write(f)
 
 def check_output(path: str) -> str:
   path = ensure_extension(path) # add .pdf in case user doesn't think of adding it
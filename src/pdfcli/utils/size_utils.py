@@ -0,0 +1,116 @@
+# Estimate how many bytes pages take once written to their own PDF, so a document can be
+# split into parts under a size limit without writing trial files.
+import re
+from io import BytesIO
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+  from pypdf import PageObject
+  from pypdf.generic import PdfObject
+
+# Decimal units, so a part under "10MB" is also under 10 MiB.
+SIZE_UNITS = {"": 1, "K": 1000, "M": 1000 ** 2, "G": 1000 ** 3}
+
+# "N 0 obj\n" + "\nendobj\n" around each object, plus its 20-byte xref entry.
+OBJECT_OVERHEAD = 48
+# Header, catalog, page tree, document info, xref header and trailer of each part.
+DOCUMENT_OVERHEAD = 1024
+# The page's entry in the page tree's /Kids array.
+PAGE_OVERHEAD = 16
+
+# (written size, references to other objects)
+ObjectInfo = Tuple[int, List[Tuple[int, int]]]
+
+# Parse a size like '10MB', '500 KB', '2k' or '2000000' into bytes.
+def parse_size(text: str) -> int:
+  match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*", text.upper())
+  if not match:
+    raise ValueError(f"Invalid size: {text}")
+
+  number, unit = match.groups()
+  return int(float(number) * SIZE_UNITS[unit])
+
+# The written size of an object and the (idnum, generation) of every object it references.
+# /Parent isn't followed, since a part builds its own page tree.
+def object_info(obj: "PdfObject") -> ObjectInfo:
+  from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject
+
+  buffer = BytesIO()
+  obj.write_to_stream(buffer)
+  size = len(buffer.getvalue()) + OBJECT_OVERHEAD
+
+  children = []
+  pending = [obj]
+  while pending:
+    value = pending.pop()
+    if isinstance(value, DictionaryObject):
+      pending.extend(item for key, item in value.items() if key != "/Parent")
+    elif isinstance(value, ArrayObject):
+      pending.extend(value)
+    elif isinstance(value, IndirectObject):
+      children.append((value.idnum, value.generation))
+
+  return size, children
+
+class PageSizer:
+
+  def __init__(self) -> None:
+    self.info: Dict[Tuple[int, int], ObjectInfo] = {} # every object seen so far, parsed once
+
+  # Every object the page needs and its size. Shared fonts and images appear for each
+  # page that uses them, so callers can tell which are already counted in a part.
+  # Other pages (e.g. link targets) aren't followed, since they aren't copied along.
+  def page_objects(self, page: "PageObject") -> Dict[Tuple[int, int], int]:
+    from pypdf.generic import DictionaryObject, IndirectObject
+
+    reader = page.indirect_reference.pdf
+    start = (page.indirect_reference.idnum, page.indirect_reference.generation)
+    needed = {}
+    pending = [start]
+
+    while pending:
+      key = pending.pop()
+      if key in needed:
+        continue
+
+      if key not in self.info:
+        obj = reader.get_object(IndirectObject(*key, reader))
+        if obj is None or (key != start and isinstance(obj, DictionaryObject) and obj.get("/Type") == "/Page"):
+          self.info[key] = (0, [])
+        else:
+          self.info[key] = object_info(obj)
+
+      size, children = self.info[key]
+      needed[key] = size
+      pending.extend(children)
+
+    return needed
+
+# Group consecutive pages into parts whose estimated size stays within limit, in one pass.
+# A page is added to the current part only for the objects the part doesn't have yet.
+# A page that is bigger than limit on its own gets a part of its own.
+def pack_pages(pages: Sequence["PageObject"], limit: int) -> List[range]:
+  sizer = PageSizer()
+  parts = []
+  start = 0
+  included = set()
+  size = DOCUMENT_OVERHEAD
+
+  for number, page in enumerate(pages):
+    needed = sizer.page_objects(page)
+    added = PAGE_OVERHEAD + sum(value for key, value in needed.items() if key not in included)
+
+    if number > start and size + added > limit:
+      parts.append(range(start, number))
+      start = number
+      included = set()
+      size = DOCUMENT_OVERHEAD
+      added = PAGE_OVERHEAD + sum(needed.values())
+
+    included.update(needed)
+    size += added
+
+  if len(pages) > start:
+    parts.append(range(start, len(pages)))
+
+  return parts
@@ -0,0 +1,90 @@
+# Write a PdfWriter's document to disk while it is still being built.
+# Each flush writes the objects added since the last one and drops them from the writer,
+# so memory stays bounded by the largest single batch instead of the whole document.
+# Like object_streams.py, this relies on PdfWriter internals kept stable by the pypdf<7 pin.
+from typing import TYPE_CHECKING, BinaryIO, Dict
+
+if TYPE_CHECKING:
+  from pypdf import PdfReader, PdfWriter
+
+class StreamingWriter:
+
+  def __init__(self, writer: "PdfWriter", stream: BinaryIO) -> None:
+    self.writer = writer
+    self.stream = stream
+    self.offsets: Dict[int, int] = {} # object number -> byte offset in the output
+    self.flushed = 0 # objects in writer._objects already handled
+
+    # the header is fixed before any input is read, so raise it to the newest version pypdf writes
+    stream.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+  # Forget everything the writer remembers about reader so it can be freed.
+  # Links between its pages are resolved first, as PdfWriter.write would do at the end.
+  def release(self, reader: "PdfReader") -> None:
+    writer = self.writer
+    writer._resolve_links()
+    writer._unresolved_links.clear()
+    writer._merged_in_pages.clear()
+    writer.reset_translation(reader)
+
+  # Write the objects added since the last flush. The catalog, page tree root and document
+  # info still change as pages are added, so they are written by close().
+  def flush(self) -> None:
+    objects = self.writer._objects
+    keep = self._kept()
+
+    for index in range(self.flushed, len(objects)):
+      obj = objects[index]
+      if obj is None or index + 1 in keep:
+        continue
+
+      self._write_object(index + 1, obj)
+      objects[index] = None
+
+    self.flushed = len(objects)
+
+  def close(self) -> None:
+    from pypdf.generic import DictionaryObject, NameObject, NumberObject
+
+    writer = self.writer
+    objects = writer._objects
+
+    for index, obj in enumerate(objects):
+      if obj is not None:
+        self._write_object(index + 1, obj)
+
+    size = len(objects) + 1
+    xref_location = self.stream.tell()
+    self.stream.write(f"xref\n0 {size}\n".encode())
+    self.stream.write(b"0000000000 65535 f \n")
+    for idnum in range(1, size):
+      if idnum in self.offsets:
+        self.stream.write(f"{self.offsets[idnum]:0>10} 00000 n \n".encode())
+      else:
+        self.stream.write(b"0000000000 00001 f \n")
+
+    trailer = DictionaryObject({
+      NameObject("/Size"): NumberObject(size),
+      NameObject("/Root"): writer.root_object.indirect_reference
+    })
+    if writer._info is not None:
+      trailer[NameObject("/Info")] = writer._info.indirect_reference
+    if writer._ID is not None:
+      trailer[NameObject("/ID")] = writer._ID
+
+    self.stream.write(b"trailer\n")
+    trailer.write_to_stream(self.stream)
+    self.stream.write(f"\nstartxref\n{xref_location}\n%%EOF\n".encode())
+
+  def _kept(self) -> set:
+    writer = self.writer
+    refs = [writer.root_object.indirect_reference, writer.root_object.raw_get("/Pages")]
+    if writer._info is not None:
+      refs.append(writer._info.indirect_reference)
+    return {ref.idnum for ref in refs}
+
+  def _write_object(self, idnum: int, obj) -> None:
+    self.offsets[idnum] = self.stream.tell()
+    self.stream.write(f"{idnum} 0 obj\n".encode())
+    obj.write_to_stream(self.stream)
+    self.stream.write(b"\nendobj\n")
@@ -1,11 +1,12 @@
 # File validation and correction
 import re
 from typing import List
-import rich
 from pathlib import Path
 
 import typer
 
+from pdfcli.utils.cli_utils import rprint
+
 INVALID_CHARS = r'\\|/|:|\*|\?|"|<|>|\|'
 
 def ensure_extension(filename: str, *, extension: str = ".pdf") -> str:
@@ -23,7 +24,7 @@ def ensure_extension(filename: str, *, extension: str = ".pdf") -> str:
   return filename
 
 def exit_with_error_message(reason: str = "") -> None:
-  rich.print(f"[red]Error! {reason}\nPlease check and try again.[/red]")
+  rprint(f"Error! {reason}\nPlease check and try again.", status=1)
   raise typer.Exit(code=1)
 
 def is_valid_filename(name: str, *, no_empty = True, no_ext = True, no_char = True) -> bool:
@@ -81,13 +82,15 @@ def path_validator(path_name: str, default: str = "") -> bool:
 
   return True
 
-# assumes the list is 0-indexed
+# assumes the list is 0-indexed. PageRanges are checked from the ends of their ranges.
 def page_validator(pages: List[int], total_pages: int) -> bool:
 
   if not pages:
     return False
 
-  if min(pages) < 0 or max(pages) >= total_pages:
+  low, high = pages.bounds() if hasattr(pages, "bounds") else (min(pages), max(pages))
+
+  if low < 0 or high >= total_pages:
     return False
   
   return True
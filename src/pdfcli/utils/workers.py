@@ -0,0 +1,45 @@
+# Worker pool helpers shared by the commands that support --jobs.
+from collections import deque
+from concurrent.futures import Executor
+from typing import Callable, Iterable, Iterator, Optional
+
+from pdfcli.utils.validators import exit_with_error_message
+
+EXECUTORS = ("thread", "process")
+
+def check_jobs(jobs: int, executor: str = "process") -> None:
+  if jobs < 1:
+    exit_with_error_message("Jobs must be at least 1.")
+
+  if executor not in EXECUTORS:
+    exit_with_error_message(f"Invalid executor: {executor}. Use one of: {', '.join(EXECUTORS)}.")
+
+# Returns None for a single job so callers can run the work inline.
+# initializer(*initargs) runs once in each worker before it takes any tasks.
+def create_executor(jobs: int, executor: str = "process", *,
+  initializer: Optional[Callable] = None, initargs: tuple = ()) -> Optional[Executor]:
+  from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+  if jobs == 1:
+    return None
+
+  if executor == "thread":
+    return ThreadPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs)
+  return ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs)
+
+# Like Executor.map, but results come back in input order while only a bounded number
+# of tasks (lookahead) are queued or finished-but-unconsumed at any time.
+def ordered_map(pool: Optional[Executor], fn: Callable, items: Iterable, *, lookahead: int) -> Iterator:
+  if pool is None:
+    yield from map(fn, items)
+    return
+
+  pending = deque()
+
+  for item in items:
+    pending.append(pool.submit(fn, item))
+    if len(pending) >= lookahead:
+      yield pending.popleft().result()
+
+  while pending:
+    yield pending.popleft().result()
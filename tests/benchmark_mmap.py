@@ -0,0 +1,95 @@
+# Peak memory (RSS) of reading a large PDF into memory versus memory-mapping it (--mmap).
+# Builds a synthetic file, then runs each command once per mode in a fresh process.
+# Not collected by pytest. Run it with:
+#
+#   python tests/benchmark_mmap.py --pages 2000 --page-kb 100
+#
+# Linux and macOS only, since peak RSS comes from /proc or the resource module.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Runs in the child process: one command, then its peak RSS and run time as JSON.
+CHILD = """
+import json, resource, sys, time
+from pdfcli.main import app
+
+start = time.perf_counter()
+try:
+  app(sys.argv[1:], prog_name="pdfcli", standalone_mode=False)
+except SystemExit:
+  pass
+elapsed = time.perf_counter() - start
+
+# ru_maxrss survives exec, so on Linux it would include the benchmark process that started
+# this one. VmHWM is this program's own peak.
+try:
+  status = open("/proc/self/status").read()
+  peak = int(status.split("VmHWM:")[1].split()[0]) * 1024
+except OSError:
+  peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss # bytes on macOS
+print(json.dumps({"rss": peak, "seconds": elapsed}))
+"""
+
+# Pages of uncompressed content, page_kb each, so the file size is close to pages * page_kb.
+def build_pdf(path: Path, pages: int, page_kb: int) -> None:
+  from pypdf import PdfWriter
+  from pypdf.generic import NameObject, StreamObject
+
+  writer = PdfWriter()
+  for number in range(1, pages + 1):
+    page = writer.add_blank_page(612, 792)
+
+    filler = os.urandom(page_kb * 512).hex() # hex doubles it to page_kb KB
+    content = StreamObject()
+    content._data = f"BT /F1 24 Tf 72 720 Td (Page {number}) Tj ET\n%{filler}\n".encode()
+    page[NameObject("/Contents")] = writer._add_object(content)
+
+  with open(path, "wb") as f:
+    writer.write(f)
+
+# Drop the file from the OS page cache, so each run starts cold like a file that was just downloaded.
+def evict(path: Path) -> None:
+  if hasattr(os, "posix_fadvise"):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+      os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+      os.close(fd)
+
+def measure(args: list) -> dict:
+  result = subprocess.run([sys.executable, "-c", CHILD, *args], capture_output=True, text=True, check=True)
+  return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Peak RSS of --mmap versus reading the input into memory.")
+  parser.add_argument("--pages", type=int, default=2000)
+  parser.add_argument("--page-kb", type=int, default=100)
+  options = parser.parse_args()
+
+  with tempfile.TemporaryDirectory() as folder:
+    source = Path(folder) / "large.pdf"
+    build_pdf(source, options.pages, options.page_kb)
+    print(f"{source.name}: {options.pages} pages, {source.stat().st_size / 1e6:.0f} MB\n")
+
+    last = options.pages
+    scenarios = {
+      f"trim 2 pages (3,{last - 1})": ["trim", str(source), "-p", f"3,{last - 1}"],
+      "reorder all pages": ["reorder", str(source), "-r", f"{last}-1"],
+    }
+
+    print(f"{'command':<28} {'mode':<8} {'peak RSS':>10} {'time':>8}")
+    for name, args in scenarios.items():
+      for mode, flags in (("read", []), ("mmap", ["--mmap"])):
+        output = Path(folder) / "output.pdf"
+        output.unlink(missing_ok=True)
+        evict(source)
+        result = measure([*args, "-o", str(output), *flags])
+        print(f"{name:<28} {mode:<8} {result['rss'] / 1e6:>7.0f} MB {result['seconds']:>7.2f}s")
+
+if __name__ == "__main__":
+  main()
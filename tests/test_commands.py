@@ -1,10 +1,13 @@
 import operator
+import subprocess
+import sys
 from pathlib import Path
 from pypdf import PdfReader
 from typer.testing import CliRunner
 import shutil
 
 from pdfcli.main import app
+from pdfcli.utils.page_utils import PdfSession
 
 runner = CliRunner()
 
@@ -123,6 +126,24 @@ def test_app():
   result = runner.invoke(app)
   assert result.exit_code == 0
 
+# --version and --help must not import the heavy command dependencies.
+# Run in a fresh interpreter so modules loaded by other tests don't leak in.
+def test_lazy_imports():
+  heavy = ("PIL", "pdf2image", "pypdf", "cryptography")
+  code = (
+    "import sys\n"
+    "from typer.testing import CliRunner\n"
+    "from pdfcli.main import app\n"
+    "CliRunner().invoke(app, ['--version'])\n"
+    "CliRunner().invoke(app, ['trim', '--help'])\n"
+    f"print(','.join(m for m in {heavy!r} if m in sys.modules))"
+  )
+
+  result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+  assert result.returncode == 0, result.stderr
+  assert result.stdout.strip() == ""
+
 class TestMergeCommand:
 
   output_name = "merge.pdf"
@@ -152,6 +173,111 @@ class TestMergeCommand:
     assert output.exists()
     assert assert_pdf(output_str, EXPECTED_MERGE)
 
+  def test_merge_dedupes_resources(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+       'merge', 
+       PDF_SAMPLE_1_PAGE_1,
+       PDF_SAMPLE_1_PAGE_1,
+       PDF_SAMPLE_1_PAGE_1,
+       '--output', 
+       output_str
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+
+    assert result.exit_code == 0
+    assert len(PdfReader(output_str).pages) == 3
+    # the three copies share all fonts and images, so the output barely grows
+    assert output.stat().st_size < Path(PDF_SAMPLE_1_PAGE_1).stat().st_size * 1.1
+
+  def test_merge_keeps_annotations_per_page(self, tmp_path: Path):
+    from pypdf import PdfWriter
+    from pypdf.annotations import Link
+
+    # a link without /P, so the copies from each input are identical
+    source = tmp_path / "link.pdf"
+    writer = PdfWriter()
+    writer.append(PdfReader(PDF_SAMPLE_1_PAGE_1))
+    link = writer.add_annotation(0, Link(rect=(50, 50, 100, 100), url="https://example.com"))
+    del link["/P"]
+    writer.write(source)
+
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+       'merge',
+       str(source),
+       str(source),
+       str(source),
+       '--output',
+       output_str
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+
+    assert result.exit_code == 0
+    pages = PdfReader(output_str).pages
+    annotations = {page.raw_get("/Annots")[0].idnum for page in pages}
+    fonts = {page["/Resources"]["/Font"].raw_get("/F1").idnum for page in pages}
+    assert len(annotations) == 3 # each page keeps its own link
+    assert len(fonts) == 1 # while resources are still shared
+
+  def test_merge_manifest_low_memory(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+    manifest = tmp_path / "inputs.txt"
+    manifest.write_text(f"# inputs\n{PDF_SAMPLE_1_PAGE_1}\n\n{PDF_SAMPLE_1_PAGE_2}\n")
+
+    result = runner.invoke(app, [
+       'merge', 
+       '--manifest',
+       str(manifest),
+       '--low-memory',
+       '--output', 
+       output_str
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+
+    assert result.exit_code == 0
+    assert output.exists()
+    assert assert_pdf(output_str, EXPECTED_MERGE)
+
+  def test_merge_jobs(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+       'merge', 
+       PDF_SAMPLE_1_PAGE_1,
+       PDF_SAMPLE_1_PAGE_2,
+       '--output', 
+       output_str,
+       '--jobs',
+       '2'
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+
+    assert result.exit_code == 0
+    assert assert_pdf(output_str, EXPECTED_MERGE) # page order matches the input order
+
 class TestImg2PdfCommand:
 
   output_name = "img2pdf.pdf"
@@ -182,6 +308,31 @@ class TestImg2PdfCommand:
     assert output.exists()
     assert assert_pdf(output_str, EXPECTED_IMG2PDF)
 
+  def test_img2pdf_jobs(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+       "img2pdf",
+       IMAGE_SAMPLE_1,
+       IMAGE_SAMPLE_2,
+       IMAGE_SAMPLE_3,
+       "--output",
+       output_str,
+       "--jobs",
+       "2",
+       "--executor",
+       "process"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+    
+    assert result.exit_code == 0
+    assert assert_pdf(output_str, EXPECTED_IMG2PDF) # page order matches the input order
+
 class TestPdf2ImgCommand:
 
   output_name = "out-img"
@@ -211,6 +362,77 @@ class TestPdf2ImgCommand:
     assert output.exists()
     assert assert_folder_content(output_str, EXPECTED_PDF2IMG, file_ext=".png")
 
+  def test_pdf2img_jobs(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+       'pdf2img',
+       PDF_SAMPLE_8_PAGE,
+       "--output",
+       output_str,
+       "--jobs",
+       "3"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+    
+    assert result.exit_code == 0
+    assert assert_folder_content(output_str, EXPECTED_PDF2IMG, file_ext=".png")
+
+  def test_pdf2img_jobs_with_pages(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+       'pdf2img',
+       PDF_SAMPLE_8_PAGE,
+       "--output",
+       output_str,
+       "--page",
+       "1-3,6",
+       "--jobs",
+       "2"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+    
+    assert result.exit_code == 0
+    assert sorted(path.name for path in output.iterdir()) == ["page_1.png", "page_2.png", "page_3.png", "page_6.png"]
+
+  def test_pdf2img_pages_and_format(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+       'pdf2img',
+       PDF_SAMPLE_8_PAGE,
+       "--output",
+       output_str,
+       "--page",
+       "2-3,7",
+       "--dpi",
+       "72",
+       "--format",
+       "jpeg",
+       "--quality",
+       "60"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+    
+    assert result.exit_code == 0
+    assert sorted(p.name for p in output.iterdir()) == ["page_2.jpg", "page_3.jpg", "page_7.jpg"]
+
 class TestTrimCommand:
 
   output_name = "trim.pdf"
@@ -241,6 +463,113 @@ class TestTrimCommand:
     assert output.exists()
     assert assert_pdf(output_str, EXPECTED_TRIM)
 
+  def test_trim_mmap(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+      "trim",
+      PDF_SAMPLE_8_PAGE,
+      "--output",
+      output_str,
+      "--page",
+      "5-6,3,1,8-5",
+      "--mmap"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+
+    assert result.exit_code == 0
+    assert output.exists()
+    assert assert_pdf(output_str, EXPECTED_TRIM)
+
+  def test_trim_sparse(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+      "trim",
+      PDF_SAMPLE_8_PAGE,
+      "--output",
+      output_str,
+      "--page",
+      "7,2"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+
+    assert result.exit_code == 0
+    # few enough pages to be found through the page tree instead of pypdf's page list
+    source = PdfReader(PDF_SAMPLE_8_PAGE).pages
+    pages = PdfReader(output_str).pages
+    assert [page.extract_text() for page in pages] == [source[6].extract_text(), source[1].extract_text()]
+
+  def test_trim_invalid_range(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+
+    result = runner.invoke(app, [
+      "trim",
+      PDF_SAMPLE_8_PAGE,
+      "--output",
+      str(output),
+      "--page",
+      "1-x"
+    ])
+
+    assert result.exit_code == 1
+    assert "Invalid page range '1-x'" in result.output
+    assert not output.exists()
+
+  def test_trim_parses_once(self, tmp_path: Path):
+    output_str = str(tmp_path / self.output_name)
+    before = PdfSession.parse_count
+
+    result = runner.invoke(app, [
+      "trim",
+      PDF_SAMPLE_8_PAGE,
+      "--output",
+      output_str,
+      "--page",
+      "1-3"
+    ])
+
+    assert result.exit_code == 0
+    assert PdfSession.parse_count == before + 1
+
+  def test_trim_object_streams(self, tmp_path: Path):
+    outputs = []
+
+    for extra in ([], ["--object-streams"]):
+      output = tmp_path / f"trim{len(extra)}.pdf"
+      outputs.append(str(output))
+
+      result = runner.invoke(app, [
+        "trim",
+        PDF_SAMPLE_8_PAGE,
+        "--output",
+        str(output),
+        "--page",
+        "5-6,3,1,8-5",
+        *extra
+      ])
+
+      print(result.output)
+      if result.exception:
+        print(result.exception)
+        print(type(result.exception))
+
+      assert result.exit_code == 0
+
+    assert compare_file_size(outputs[1], outputs[0], comparison="<")
+    assert assert_pdf(outputs[1], EXPECTED_TRIM)
+    assert b"/ObjStm" in Path(outputs[1]).read_bytes()
+
 class TestReorderCommand:
 
   output_name = "reorder.pdf"
@@ -271,6 +600,59 @@ class TestReorderCommand:
     assert output.exists()
     assert assert_pdf(output_str, EXPECTED_REORDER)
 
+  def test_reorder_incremental(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+      "reorder",
+      PDF_SAMPLE_8_PAGE,
+      "--output",
+      output_str,
+      "--order",
+      "4,3,2,5,7,8,1",
+      "--incremental"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+
+    assert result.exit_code == 0
+    assert output.exists()
+    assert assert_pdf(output_str, EXPECTED_REORDER)
+
+    # the original bytes are kept and the update is appended after them
+    original = Path(PDF_SAMPLE_8_PAGE).read_bytes()
+    assert output.read_bytes().startswith(original)
+
+  def test_reorder_incremental_mmap_in_place(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+    shutil.copyfile(PDF_SAMPLE_8_PAGE, output)
+    parses = PdfSession.parse_count
+
+    result = runner.invoke(app, [
+      "reorder",
+      output_str,
+      "--output",
+      output_str,
+      "--order",
+      "4,3,2,5,7,8,1",
+      "--incremental",
+      "--mmap"
+    ], input="y\n")
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+
+    assert result.exit_code == 0
+    assert PdfSession.parse_count == parses + 1
+    assert assert_pdf(output_str, EXPECTED_REORDER)
+
 class TestSplitCommand:
 
   output_name = "split"
@@ -301,6 +683,99 @@ class TestSplitCommand:
     assert output.exists()
     assert assert_folder_content(output_str, EXPECTED_SPLIT, file_ext=".pdf")
 
+  def test_split_jobs(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+      "split",
+      PDF_SAMPLE_8_PAGE,
+      "--output",
+      output_str,
+      "--part",
+      "1,5-8,3-4",
+      "--jobs",
+      "2"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+    
+    assert result.exit_code == 0
+    assert assert_folder_content(output_str, EXPECTED_SPLIT, file_ext=".pdf")
+
+  def test_split_every(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+      "split",
+      PDF_SAMPLE_8_PAGE,
+      "--output",
+      output_str,
+      "--every",
+      "3"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+    
+    assert result.exit_code == 0
+    counts = [len(PdfReader(str(output / f"output-{index}.pdf")).pages) for index in range(1, 4)]
+    assert counts == [3, 3, 2]
+    assert not (output / "output-4.pdf").exists()
+
+  def test_split_burst(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+      "split",
+      PDF_SAMPLE_8_PAGE,
+      "--output",
+      output_str,
+      "--burst"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+    
+    assert result.exit_code == 0
+    assert len(list(output.glob("*.pdf"))) == 8
+    source = PdfReader(PDF_SAMPLE_8_PAGE)
+    part = PdfReader(str(output / "output-5.pdf"))
+    assert part.pages[0].extract_text() == source.pages[4].extract_text()
+
+  def test_split_max_size(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+      "split",
+      PDF_SAMPLE_8_PAGE,
+      "--output",
+      output_str,
+      "--max-size",
+      "320KB"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+    
+    assert result.exit_code == 0
+    parts = sorted(output.glob("*.pdf"))
+    assert len(parts) > 1
+    assert all(part.stat().st_size <= 320_000 for part in parts)
+    assert sum(len(PdfReader(str(part)).pages) for part in parts) == 8
+
 class TesteEncryptCommand:
 
   output_name = "encrypt.pdf"
@@ -331,6 +806,32 @@ class TesteEncryptCommand:
     assert output.exists()
     assert assert_pdf(output_str, EXPECTED_ENCRYPT, password=ENCRYPTION_PASSWORD)
 
+  def test_encrypt_object_streams(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+      "encrypt",
+      PDF_SAMPLE_8_PAGE,
+      "--output",
+      output_str,
+      "--password",
+      ENCRYPTION_PASSWORD,
+      "--object-streams"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+
+    assert result.exit_code == 0
+    assert assert_pdf(output_str, EXPECTED_ENCRYPT, password=ENCRYPTION_PASSWORD)
+
+    reader = PdfReader(output_str)
+    reader.decrypt(ENCRYPTION_PASSWORD)
+    assert reader.pages[0].extract_text() == PdfReader(PDF_SAMPLE_8_PAGE).pages[0].extract_text()
+
   def test_remove_after(self, tmp_path: Path):
     output_name = "encrypt-rm_test.pdf"
     output = tmp_path / output_name
@@ -452,4 +953,246 @@ class TesteCompressCommand:
     assert result.exit_code == 0
     assert output.exists()
     assert compare_file_size(PDF_SAMPLE_40MB, output_str, comparison=">")
-    
\ No newline at end of file
+
+  def test_compress_jobs(self, tmp_path: Path):
+    outputs = []
+
+    for jobs in ("1", "2"):
+      output = tmp_path / f"compress-{jobs}.pdf"
+      outputs.append(output)
+
+      result = runner.invoke(app, [
+        "compress",
+        EXPECTED_MERGE, # two pages with one image each
+        "--output",
+        str(output),
+        "--jobs",
+        jobs
+      ])
+
+      print(result.output)
+      if result.exception:
+        print(result.exception)
+        print(type(result.exception))
+
+      assert result.exit_code == 0
+
+    assert compare_file_size(EXPECTED_MERGE, str(outputs[0]), comparison=">")
+    assert outputs[0].read_bytes() == outputs[1].read_bytes()
+
+  def test_compress_image_cache(self, tmp_path: Path):
+    from pypdf import PdfWriter
+
+    # the same image on three pages, plus one different image
+    source = tmp_path / "shared.pdf"
+    writer = PdfWriter()
+    for pdf in (PDF_SAMPLE_1_PAGE_1, PDF_SAMPLE_1_PAGE_1, PDF_SAMPLE_1_PAGE_1, PDF_SAMPLE_1_PAGE_2):
+      writer.append(PdfReader(pdf))
+    writer.write(source)
+
+    output = tmp_path / self.output_name
+
+    result = runner.invoke(app, [
+      "compress",
+      str(source),
+      "--output",
+      str(output),
+      "--verbose"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+
+    assert result.exit_code == 0
+    # the three copies are merged into one object before images are recompressed
+    assert "Image cache: 0 hits, 2 misses" in result.output
+
+  def test_compress_image_cache_separate_objects(self, tmp_path: Path):
+    from pypdf import PdfWriter
+    from pypdf.generic import NameObject, StreamObject
+
+    # the same image on three pages. The first two copies are merged into one object,
+    # the third isn't because it lists its dictionary entries in a different order.
+    source = tmp_path / "copies.pdf"
+    writer = PdfWriter()
+    for pdf in (PDF_SAMPLE_1_PAGE_1, PDF_SAMPLE_1_PAGE_1, PDF_SAMPLE_1_PAGE_1):
+      writer.append(PdfReader(pdf))
+
+    xobjects = writer.pages[2]["/Resources"]["/XObject"]
+    for name, ref in xobjects.items():
+      image = ref.get_object()
+      if image.get("/Subtype") == "/Image":
+        copy = StreamObject()
+        copy._data = image._data
+        copy.update(reversed(list(image.items())))
+        xobjects[NameObject(name)] = writer._add_object(copy)
+    writer.write(source)
+
+    output = tmp_path / self.output_name
+
+    result = runner.invoke(app, [
+      "compress",
+      str(source),
+      "--output",
+      str(output),
+      "--verbose"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+
+    assert result.exit_code == 0
+    assert "Image cache: 1 hits, 1 misses" in result.output
+
+  def test_compress_max_dpi(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+      "compress",
+      EXPECTED_MERGE,
+      "--output",
+      output_str,
+      "--max-dpi",
+      "30"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+
+    assert result.exit_code == 0
+    # both images are drawn about 3 inches wide, so 30 DPI is roughly 90-100 pixels
+    for page in PdfReader(output_str).pages:
+      assert page.images[0].image.width < 100
+    
+class TestAnalyzeCommand:
+
+  def test_analyze_help(self):
+    result = runner.invoke(app, ['analyze', '--help'])
+    assert result.exit_code == 0
+
+  def test_analyze(self):
+    before = Path(EXPECTED_MERGE).read_bytes()
+
+    result = runner.invoke(app, [
+      "analyze",
+      EXPECTED_MERGE,
+      "--top",
+      "3"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+
+    assert result.exit_code == 0
+    assert "Bytes by category" in result.output
+    assert "Estimated compress output" in result.output
+    assert Path(EXPECTED_MERGE).read_bytes() == before # nothing is rewritten
+
+class TestPipelineCommand:
+
+  output_name = "pipeline.pdf"
+
+  def test_pipeline_help(self):
+    result = runner.invoke(app, ['pipeline', '--help'])
+    assert result.exit_code == 0
+
+  def test_pipeline_compress_options_need_compress(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+
+    result = runner.invoke(app, [
+      "pipeline",
+      PDF_SAMPLE_8_PAGE,
+      "--output",
+      str(output),
+      "--max-dpi",
+      "150"
+    ])
+
+    print(result.output)
+
+    assert result.exit_code == 1
+    assert "--compress" in result.output
+    assert not output.exists()
+
+  def test_pipeline(self, tmp_path: Path):
+    output = tmp_path / self.output_name
+    output_str = str(output)
+
+    result = runner.invoke(app, [
+      "pipeline",
+      PDF_SAMPLE_PROTECTED,
+      "--output",
+      output_str,
+      "--password",
+      ENCRYPTION_PASSWORD,
+      "--trim",
+      "2-1",
+      "--compress",
+      "low",
+      "--encrypt",
+      "new-password",
+      "--verbose"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+
+    assert result.exit_code == 0
+    for step in ("decrypt", "trim", "compress", "encrypt", "write"):
+      assert f"{step}:" in result.output
+    assert list(tmp_path.iterdir()) == [output] # no intermediate files
+
+    reader = PdfReader(output_str)
+    assert reader.is_encrypted
+    reader.decrypt("new-password")
+    source = PdfReader(PDF_SAMPLE_PROTECTED, password=ENCRYPTION_PASSWORD)
+    assert [page.extract_text() for page in reader.pages] == [page.extract_text() for page in source.pages[1::-1]]
+
+class TestBatchCommand:
+
+  def test_batch_help(self):
+    result = runner.invoke(app, ['batch', '--help'])
+    assert result.exit_code == 0
+
+  def test_batch_continues_past_failures(self, tmp_path: Path):
+    input_folder = tmp_path / "in"
+    input_folder.mkdir()
+    for name in ("a.pdf", "b.pdf"):
+      (input_folder / name).write_bytes(Path(PDF_SAMPLE_8_PAGE).read_bytes())
+    (input_folder / "broken.pdf").write_bytes(b"not a pdf")
+    output = tmp_path / "out"
+
+    result = runner.invoke(app, [
+      "batch",
+      "trim",
+      str(input_folder),
+      "--output",
+      str(output),
+      "--jobs",
+      "2",
+      "--",
+      "--page",
+      "1-2"
+    ])
+
+    print(result.output)
+    if result.exception:
+      print(result.exception)
+      print(type(result.exception))
+
+    assert result.exit_code == 1 # broken.pdf failed
+    assert "2 succeeded, 1 failed" in result.output
+    for name in ("a.pdf", "b.pdf"):
+      assert len(PdfReader(str(output / name)).pages) == 2
+    assert not (output / "broken.pdf").exists()
@@ -1,5 +1,11 @@
+from pathlib import Path
 import pytest
-from pdfcli.utils.page_utils import parse_page_ranges, dedupe_ordered, add_remaining_pages
+from pdfcli.utils.image_utils import target_size
+from pdfcli.utils.image_pdf import ImagePdfWriter, encode_image, jpeg_passthrough, load_image
+from pdfcli.utils.size_utils import parse_size
+from pdfcli.utils.page_tree import PageTree, page_source
+from pdfcli.utils.page_utils import PageRanges, PdfSession, parse_page_ranges, dedupe_ordered, add_remaining_pages, page_chunks, worker_ranges
+from pdfcli.utils.workers import create_executor, ordered_map
 from pdfcli.utils.validators import ensure_extension, page_validator, path_validator
 
 # parse_page_ranges tests
@@ -19,6 +25,23 @@ def test_invalid_range():
   with pytest.raises(ValueError):
       parse_page_ranges("3-")  # should fail
 
+def test_invalid_range_message():
+  with pytest.raises(ValueError, match="Invalid page range '2-x'"):
+      parse_page_ranges("1,2-x")
+
+def test_large_range_stays_compact():
+  pages = parse_page_ranges("1-1000000,5-10", subtract_one=True)
+  assert pages.ranges == [range(0, 1000000)]
+  assert len(pages) == 1000000
+  assert page_validator(pages, total_pages=1000000) is True
+  assert page_validator(pages, total_pages=999999) is False
+
+def test_dedupe_overlapping_reversed_ranges():
+  assert parse_page_ranges("3-6,8-1") == [3,4,5,6,8,7,2,1]
+
+def test_page_ranges_complement():
+  assert PageRanges([range(2, 4), range(7, 5, -1)]).complement(9) == [0,1,4,5,8]
+
 # dedupe_ordered tests
 def test_dedupe_ordered():
   assert dedupe_ordered([1,1,2,3,2,4]) == [1,2,3,4]
@@ -28,6 +51,23 @@ def test_add_remaining_pages():
   result = add_remaining_pages([2,0], total_pages=5)
   assert result == [2,0,1,3,4]  # verifying order
 
+# page_chunks tests
+def test_page_chunks_even_split():
+  assert page_chunks([1,2,3,4,5,6], 3) == [(1,3),(4,6)]
+
+def test_page_chunks_breaks_on_gaps():
+  assert page_chunks([1,2,3,4,5,9], 2) == [(1,2),(3,4),(5,5),(9,9)]
+
+# worker_ranges tests
+def test_worker_ranges_even_split():
+  assert worker_ranges(list(range(1, 9)), 3) == [(1,3),(4,6),(7,8)]
+
+def test_worker_ranges_keeps_runs_whole():
+  assert worker_ranges([1,2,3,6], 2) == [(1,3),(6,6)]
+
+def test_worker_ranges_more_jobs_than_pages():
+  assert worker_ranges([1,2], 5) == [(1,1),(2,2)]
+
 # ensure_extension tests
 def test_add_extension():
   assert ensure_extension("output") == "output.pdf"
@@ -83,4 +123,284 @@ def test_spaces_are_trimmed():
   assert path_validator("   folder   ") is True
 
 def test_forward_and_backslashes():
-  assert path_validator("foo\\bar/baz") is True
\ No newline at end of file
+  assert path_validator("foo\\bar/baz") is True
+
+# PdfSession tests
+INPUT = Path(__file__).parent / "data" / "input"
+
+def test_session_parses_once():
+  before = PdfSession.parse_count
+  session = PdfSession(str(INPUT / "8pages.pdf"))
+
+  assert PdfSession.parse_count == before # nothing parsed until the reader is needed
+  assert session.page_count == 8
+  assert session.reader is session.reader
+  assert PdfSession.parse_count == before + 1
+
+def test_session_keeps_password():
+  session = PdfSession(str(INPUT / "protected.pdf"), password="12345")
+
+  assert session.page_count > 0
+  assert session.password == "12345"
+
+def test_session_mmap():
+  import mmap
+
+  session = PdfSession(str(INPUT / "protected.pdf"), password="12345", mmap=True)
+
+  assert isinstance(session.reader.stream, mmap.mmap)
+  assert session.page_count > 0
+
+def test_session_preload_reads_only_page_objects(tmp_path: Path):
+  from pypdf import PdfWriter
+  from pypdf.generic import DictionaryObject, NameObject
+
+  writer = PdfWriter()
+  writer.add_blank_page(100, 100)
+  used = writer._add_object(DictionaryObject({NameObject("/Used"): NameObject("/Yes")}))
+  writer.pages[0][NameObject("/PieceInfo")] = used
+  unused = writer._add_object(DictionaryObject({NameObject("/Used"): NameObject("/No")}))
+  path = tmp_path / "unused.pdf"
+  writer.write(path)
+
+  reader = PdfSession(str(path)).preload().reader
+
+  assert (0, used.idnum) in reader.resolved_objects
+  assert (0, unused.idnum) not in reader.resolved_objects
+
+# ImagePdfWriter tests
+def test_image_pdf_writer(tmp_path: Path):
+  from pypdf import PdfReader
+
+  output = tmp_path / "images.pdf"
+
+  with open(output, "wb") as f:
+    writer = ImagePdfWriter(f)
+    for path in ("photo1.jpg", "photo2.jpg"):
+      for image in encode_image(str(INPUT / path)):
+        writer.add_page(image)
+    writer.close()
+
+  reader = PdfReader(output, strict=True)
+  assert len(reader.pages) == 2
+  assert reader.pages[1].mediabox.width == 1920
+  assert reader.pages[1].mediabox.height == 2880
+
+def test_jpeg_passthrough_keeps_bytes(tmp_path: Path):
+  from pypdf import PdfReader
+
+  data = (INPUT / "photo1.jpg").read_bytes()
+  image = jpeg_passthrough(data)
+
+  assert (image.width, image.height, image.color_space) == (1920, 2560, "DeviceRGB")
+
+  output = tmp_path / "passthrough.pdf"
+  with open(output, "wb") as f:
+    writer = ImagePdfWriter(f)
+    writer.add_page(*load_image(str(INPUT / "photo1.jpg")))
+    writer.close()
+
+  xobject = PdfReader(output).pages[0]["/Resources"]["/XObject"]["/Im0"].get_object()
+  assert xobject.get_data() == data
+
+def test_png_falls_back_to_pillow(tmp_path: Path):
+  from PIL import Image
+
+  png = tmp_path / "image.png"
+  Image.new("RGBA", (10, 7)).save(png)
+
+  assert jpeg_passthrough(png.read_bytes()) is None
+  [image] = load_image(str(png))
+  assert image[1:4] == (10, 7, "DeviceRGB")
+
+def test_bilevel_png_stays_1_bit(tmp_path: Path):
+  from PIL import Image, ImageDraw
+  from pypdf import PdfReader
+
+  png = tmp_path / "scan.png"
+  scan = Image.new("1", (200, 100), 1)
+  ImageDraw.Draw(scan).rectangle((20, 20, 120, 60), fill=0)
+  scan.save(png)
+
+  [image] = load_image(str(png))
+  assert (image.color_space, image.bits) == ("DeviceGray", 1)
+  assert image.filter in ("CCITTFaxDecode", "FlateDecode")
+
+  output = tmp_path / "scan.pdf"
+  with open(output, "wb") as f:
+    writer = ImagePdfWriter(f)
+    writer.add_page(image)
+    writer.close()
+
+  # lossless, unlike a JPEG
+  embedded = PdfReader(output).pages[0].images[0].image
+  assert embedded.convert("L").tobytes() == scan.convert("L").tobytes()
+
+def test_palette_png_is_indexed(tmp_path: Path):
+  from PIL import Image, ImageDraw
+
+  png = tmp_path / "palette.png"
+  palette = Image.new("P", (30, 20))
+  palette.putpalette([0, 0, 0, 255, 0, 0, 0, 0, 255])
+  ImageDraw.Draw(palette).rectangle((5, 5, 15, 15), fill=2)
+  palette.save(png)
+
+  [image] = load_image(str(png))
+  assert (image.color_space, image.filter) == ("DeviceRGB", "FlateDecode")
+  assert image.palette[6:9] == bytes([0, 0, 255])
+
+def test_multi_frame_tiff_adds_every_frame(tmp_path: Path):
+  from pypdf import PdfReader
+  from PIL import Image
+
+  tiff = tmp_path / "scans.tiff"
+  frames = [Image.new("RGB", (40 + 10 * n, 30), (60 * n, 0, 0)) for n in range(3)]
+  frames[0].save(tiff, save_all=True, append_images=frames[1:])
+
+  output = tmp_path / "scans.pdf"
+  with open(output, "wb") as f:
+    writer = ImagePdfWriter(f)
+    for image in load_image(str(tiff)):
+      writer.add_page(image)
+    writer.close()
+
+  pages = PdfReader(output).pages
+  assert [page.mediabox.width for page in pages] == [40, 50, 60]
+
+def test_16_bit_grayscale_is_scaled(tmp_path: Path):
+  from io import BytesIO
+  from PIL import Image
+
+  png = tmp_path / "depth.png"
+  depth = Image.new("I;16", (4, 1))
+  for x, value in enumerate((0, 1000, 30000, 65535)):
+    depth.putpixel((x, 0), value)
+  depth.save(png)
+
+  [image] = load_image(str(png))
+  assert image.color_space == "DeviceGray"
+
+  decoded = Image.open(BytesIO(image.data))
+  # JPEG is lossy, so allow a little slack around 0, 3, 117 and 255
+  for pixel, expected in zip(decoded.getdata(), (0, 3, 117, 255)):
+    assert abs(pixel - expected) <= 8
+
+# ordered_map tests
+def test_ordered_map_keeps_order():
+  with create_executor(3, "thread") as pool:
+    assert list(ordered_map(pool, abs, range(0, -20, -1), lookahead=4)) == list(range(20))
+
+def test_ordered_map_inline():
+  assert create_executor(1) is None
+  assert list(ordered_map(None, abs, [-2, -1], lookahead=1)) == [2, 1]
+
+# target_size tests
+def test_target_size_downsamples():
+  # 3000px wide image drawn 5 inches wide is 600 DPI
+  assert target_size({"/Width": 3000, "/Height": 1500}, (360, 180), 150) == (750, 375)
+
+def test_target_size_keeps_low_resolution():
+  assert target_size({"/Width": 300, "/Height": 150}, (360, 180), 150) is None
+
+# parse_size tests
+def test_parse_size_units():
+  assert parse_size("10MB") == 10_000_000
+  assert parse_size("500 kb") == 500_000
+  assert parse_size("2048") == 2048
+
+def test_parse_size_invalid():
+  with pytest.raises(ValueError):
+    parse_size("10XB")
+
+# PageTree tests
+# A document whose pages hang below nested /Pages nodes of up to three kids each.
+# The root holds the /MediaBox every page inherits. count_offset is added to the /Count
+# of the root's first kid, and to the root's so that the root itself still adds up.
+def nested_pdf(path: Path, pages: int, count_offset: int = 0) -> None:
+  from pypdf import PdfWriter
+  from pypdf.generic import ArrayObject, DictionaryObject, NameObject, NumberObject, RectangleObject, StreamObject
+
+  writer = PdfWriter()
+  level = []
+  for number in range(1, pages + 1):
+    content = StreamObject()
+    content._data = f"BT /F1 12 Tf 72 720 Td (Page {number}) Tj ET".encode()
+    level.append((writer._add_object(DictionaryObject({
+      NameObject("/Type"): NameObject("/Page"),
+      NameObject("/Contents"): writer._add_object(content)
+    })), 1))
+
+  while len(level) > 3:
+    parents = []
+    for start in range(0, len(level), 3):
+      kids = level[start:start + 3]
+      count = sum(count for _, count in kids)
+      node = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Pages"),
+        NameObject("/Kids"): ArrayObject(kid for kid, _ in kids),
+        NameObject("/Count"): NumberObject(count)
+      }))
+      for kid, _ in kids:
+        kid.get_object()[NameObject("/Parent")] = node
+      parents.append((node, count))
+    level = parents
+
+  first = level[0][0].get_object()
+  first[NameObject("/Count")] = NumberObject(first["/Count"] + count_offset)
+
+  root = writer._pages.get_object()
+  root[NameObject("/Kids")] = ArrayObject(kid for kid, _ in level)
+  root[NameObject("/Count")] = NumberObject(pages + count_offset)
+  root[NameObject("/MediaBox")] = RectangleObject([0, 0, 300, 400])
+  for kid, _ in level:
+    kid.get_object()[NameObject("/Parent")] = writer._pages
+
+  with open(path, "wb") as f:
+    writer.write(f)
+
+def page_text(page) -> bytes:
+  return page.get_contents().get_data()
+
+def test_page_tree_matches_pages(tmp_path: Path):
+  from pypdf import PdfReader
+
+  nested_pdf(tmp_path / "nested.pdf", 40)
+  reader = PdfReader(tmp_path / "nested.pdf")
+  tree = page_source(reader)
+
+  assert isinstance(tree, PageTree)
+  assert len(tree) == 40
+  assert page_text(tree[-1]).endswith(b"(Page 40) Tj ET")
+  assert reader.flattened_pages is None # found without listing every page
+
+  pages = PdfReader(tmp_path / "nested.pdf").pages
+  for index in range(40):
+    assert tree[index].indirect_reference.idnum == pages[index].indirect_reference.idnum
+    assert tree[index].mediabox == pages[index].mediabox == [0, 0, 300, 400]
+
+def test_page_tree_wrong_subtree_count(tmp_path: Path):
+  from pypdf import PdfReader
+
+  # the first subtree claims one page less than it has, and the root agrees with it
+  nested_pdf(tmp_path / "broken.pdf", 40, count_offset=-1)
+  pages = page_source(PdfReader(tmp_path / "broken.pdf"))
+
+  # the subtree doesn't add up once the lookup reaches it, so pypdf's list is used,
+  # which doesn't rely on /Count
+  assert page_text(pages[20]).endswith(b"(Page 21) Tj ET")
+  assert pages.broken
+  assert len(pages) == 40
+
+def test_page_tree_reads_only_the_path(tmp_path: Path):
+  from pypdf import PdfReader
+
+  # 729 pages, three kids per node, six levels below the root
+  nested_pdf(tmp_path / "large.pdf", 729)
+  reader = PdfReader(tmp_path / "large.pdf")
+  tree = page_source(reader)
+
+  before = len(reader.resolved_objects)
+  assert page_text(tree[500]).endswith(b"(Page 501) Tj ET")
+  # the three kids of each node on the path and the page's contents, out of ~1800 objects
+  assert len(reader.resolved_objects) - before <= 6 * 3 + 1
+  assert reader.flattened_pages is None